@@ -1,3 +1,4 @@
+import os
 from flask import Flask
 from .extensions import db, migrate, jwt
 from gym_saas.config import DevelopmentConfig
@@ -76,6 +77,15 @@ def create_app():
     from gym_saas.app.routes.public import public_bp
     app.register_blueprint(public_bp)
 
+    from .commands import register_commands
+    register_commands(app)
+
+    # web processes only: `flask db upgrade` and friends must not sweep
+    if (app.config.get("MEMBERSHIP_SWEEP_INTERVAL")
+            and os.environ.get("FLASK_RUN_FROM_CLI") != "true"):
+        from .scheduler import start_membership_sweeper
+        start_membership_sweeper(app, app.config["MEMBERSHIP_SWEEP_INTERVAL"])
+
     # with app.app_context():
     #     try:
     #         db.session.execute(
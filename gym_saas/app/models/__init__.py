@@ -3,4 +3,5 @@ from .gym import Gym
 from .members import Member
 from .plan import Plan
 from .membership import Membership
-from .payment import Payment
\ No newline at end of file
+from .payment import Payment
+from .revenue_daily import RevenueDaily
@@ -6,7 +6,7 @@ from datetime import datetime
 class Gym(db.Model):
     __tablename__ = "gyms"
 
-    id: Mapped[str] = mapped_column(db.String(50), primary_key=True)
+    id: Mapped[str] = mapped_column(db.Uuid(as_uuid=False), primary_key=True)
 
     name: Mapped[str] = mapped_column(db.String(100), nullable=False)
 
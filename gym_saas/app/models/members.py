@@ -2,14 +2,14 @@ from sqlalchemy import DateTime
 from sqlalchemy.orm import Mapped, mapped_column
 from gym_saas.app.extensions import db
 from datetime import datetime
-from sqlalchemy import Index, text
+from sqlalchemy import Index, func, text
 
 class Member(db.Model):
     __tablename__ = "members"        
 
-    id: Mapped[str] = mapped_column(db.String(50), primary_key=True)
+    id: Mapped[str] = mapped_column(db.Uuid(as_uuid=False), primary_key=True)
 
-    gym_id: Mapped[str] = mapped_column(db.String(50),
+    gym_id: Mapped[str] = mapped_column(db.Uuid(as_uuid=False),
                                         db.ForeignKey("gyms.id"),
                                         nullable=False,
                                         index=True)
@@ -37,6 +37,14 @@ class Member(db.Model):
     unique=True,
     postgresql_where=text("phone_number IS NOT NULL")
     ),
+    Index(
+    "ix_members_name_trgm",
+    "name",
+    postgresql_using="gin",
+    postgresql_ops={"name": "gin_trgm_ops"}
+    ),
+    # directory pages: WHERE gym_id ORDER BY name, id
+    Index("ix_members_gym_name", "gym_id", "name", "id"),
     )
 
     memberships = db.relationship("Membership",
@@ -53,3 +61,12 @@ class Member(db.Model):
             "created_at": self.created_at.isoformat(),
             "is_active": self.is_active
         }
+
+
+# front desk types the last digits of a phone number; a prefix LIKE on the
+# reversed number can walk this index
+Index("ix_members_gym_phone_reversed",
+      Member.gym_id,
+      func.reverse(Member.phone_number).label("phone_reversed"),
+      postgresql_ops={"phone_reversed": "text_pattern_ops"},
+      postgresql_where=Member.phone_number.isnot(None))
@@ -1,4 +1,6 @@
-from sqlalchemy import DateTime
+from sqlalchemy import DateTime, Index, case
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.sql.expression import Grouping
 from sqlalchemy.orm import Mapped, mapped_column
 from gym_saas.app.extensions import db
 from datetime import datetime
@@ -8,23 +10,26 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from .plan import Plan
 
+# expired first (needs attention), then active, then cancelled
+STATUS_RANK = {"expired": 1, "active": 2, "cancelled": 3}
+
 
 class Membership(db.Model):
     __tablename__ = "memberships"
 
-    id: Mapped[str] = mapped_column(db.String(50), primary_key=True)
+    id: Mapped[str] = mapped_column(db.Uuid(as_uuid=False), primary_key=True)
 
-    member_id: Mapped[str] = mapped_column(db.String(50),
+    member_id: Mapped[str] = mapped_column(db.Uuid(as_uuid=False),
                                            db.ForeignKey("members.id"),
                                            nullable=False,
                                            index=True)
 
-    gym_id: Mapped[str] = mapped_column(db.String(50),
+    gym_id: Mapped[str] = mapped_column(db.Uuid(as_uuid=False),
                                         db.ForeignKey("gyms.id"),
                                         nullable=False,
                                         index=True)
 
-    plan_id: Mapped[str] = mapped_column(db.String(50),
+    plan_id: Mapped[str] = mapped_column(db.Uuid(as_uuid=False),
                                          db.ForeignKey("plans.id"),
                                          nullable=False,
                                          index=True)
@@ -45,6 +50,9 @@ class Membership(db.Model):
 
     is_active: Mapped[bool] = mapped_column(default=True)
 
+    # when the membership stopped; end_date keeps the paid-for term
+    cancelled_at: Mapped[datetime | None] = mapped_column(DateTime)
+
     created_at: Mapped[datetime] = mapped_column(DateTime,
                                                  default=datetime.utcnow,
                                                  index=True)
@@ -55,6 +63,14 @@ class Membership(db.Model):
                             backref="membership",
                             cascade="all, delete-orphan")
 
+    @hybrid_property
+    def status_rank(self):
+        return STATUS_RANK.get(self.status, 4)
+
+    @status_rank.expression
+    def status_rank(cls):
+        return case(STATUS_RANK, value=cls.status, else_=4)
+
     @property
     def currently_active(self):
         return (self.is_active and self.status == "active"
@@ -69,5 +85,24 @@ class Membership(db.Model):
             "end_date": self.end_date.isoformat(),
             "status": self.status,
             "is_active": self.is_active,
+            "cancelled_at": (self.cancelled_at.isoformat()
+                             if self.cancelled_at else None),
             "created_at": self.created_at.isoformat()
         }
+
+
+# serves the keyset-paginated membership listing
+Index("ix_memberships_gym_status_rank_end_date", Membership.gym_id,
+      Grouping(Membership.status_rank), Membership.end_date, Membership.id)
+
+# at most one active membership per member, enforced by the database
+Index("uq_membership_active_per_member",
+      Membership.member_id,
+      unique=True,
+      postgresql_where=Membership.is_active)
+
+# sweeps and active-membership counts only touch the is_active rows
+Index("ix_memberships_gym_end_date_active",
+      Membership.gym_id,
+      Membership.end_date,
+      postgresql_where=Membership.is_active.is_(True))
@@ -1,31 +1,34 @@
 from sqlalchemy.orm import Mapped, mapped_column
 from gym_saas.app.extensions import db
 from datetime import datetime
-from sqlalchemy import DateTime, Numeric
+from sqlalchemy import DateTime, Index, Numeric
 from decimal import Decimal
 
+# shared with the revenue_daily rollup, which groups by both
+PAYMENT_METHOD_ENUM = db.Enum("cash", "upi", name="payment_methods")
+PAYMENT_STATUS_ENUM = db.Enum("PENDING", "PAID", "FAILED",
+                              name="payment_status")
+
 class Payment(db.Model):
   __tablename__ = "payments"
 
-  id: Mapped[str] = mapped_column(db.String(50),primary_key=True)
+  id: Mapped[str] = mapped_column(db.Uuid(as_uuid=False),primary_key=True)
 
-  gym_id: Mapped[str] = mapped_column(db.String(50),
+  gym_id: Mapped[str] = mapped_column(db.Uuid(as_uuid=False),
                             db.ForeignKey("gyms.id"),
                             nullable=False,
                             index= True)
   
-  membership_id: Mapped[str] = mapped_column(db.String(50),
+  membership_id: Mapped[str] = mapped_column(db.Uuid(as_uuid=False),
                             db.ForeignKey("memberships.id"),
-                            nullable=False,
-                            index= True)
+                            nullable=False)
 
   amount: Mapped[Decimal] = mapped_column(Numeric(10,2), nullable=False)
 
-  payment_method: Mapped[str] = mapped_column(db.Enum("cash", "upi", name="payment_methods"),
+  payment_method: Mapped[str] = mapped_column(PAYMENT_METHOD_ENUM,
                              nullable=False)
 
-  status: Mapped[str] = mapped_column(db.Enum("PENDING", "PAID", "FAILED",
-                     name="payment_status"),
+  status: Mapped[str] = mapped_column(PAYMENT_STATUS_ENUM,
                      nullable=False,
                      default="PENDING",
                      index= True)
@@ -45,3 +48,12 @@ class Payment(db.Model):
         "paid_at": self.paid_at.isoformat(),
         "created_at": self.created_at.isoformat()
     }
+
+
+# serves the keyset-paginated payment ledger
+Index("ix_payments_gym_created_at_id", Payment.gym_id,
+      Payment.created_at.desc(), Payment.id.desc())
+
+# covering index: per-membership paid totals become index-only scans
+Index("ix_payments_membership_covering", Payment.membership_id,
+      postgresql_include=["gym_id", "amount"])
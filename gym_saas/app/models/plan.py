@@ -13,9 +13,9 @@ if TYPE_CHECKING:
 class Plan(db.Model):
     __tablename__ = "plans"
 
-    id: Mapped[str] = mapped_column(db.String(50), primary_key=True)
+    id: Mapped[str] = mapped_column(db.Uuid(as_uuid=False), primary_key=True)
 
-    gym_id: Mapped[str] = mapped_column(db.String(50),
+    gym_id: Mapped[str] = mapped_column(db.Uuid(as_uuid=False),
                                         db.ForeignKey("gyms.id"),
                                         nullable=False,
                                         index=True)
@@ -0,0 +1,42 @@
+from sqlalchemy.orm import Mapped, mapped_column
+from gym_saas.app.extensions import db
+from gym_saas.app.models.payment import (PAYMENT_METHOD_ENUM,
+                                         PAYMENT_STATUS_ENUM)
+from sqlalchemy import Numeric
+from decimal import Decimal
+from datetime import date
+
+
+# one row per gym, day, method and status; kept in step with payments
+class RevenueDaily(db.Model):
+    __tablename__ = "revenue_daily"
+
+    gym_id: Mapped[str] = mapped_column(db.Uuid(as_uuid=False),
+                                        db.ForeignKey("gyms.id"),
+                                        primary_key=True)
+
+    day: Mapped[date] = mapped_column(db.Date, primary_key=True)
+
+    payment_method: Mapped[str] = mapped_column(PAYMENT_METHOD_ENUM,
+                                                primary_key=True)
+
+    status: Mapped[str] = mapped_column(PAYMENT_STATUS_ENUM,
+                                        primary_key=True)
+
+    total_amount: Mapped[Decimal] = mapped_column(Numeric(14, 2),
+                                                  nullable=False,
+                                                  default=0)
+
+    payment_count: Mapped[int] = mapped_column(db.Integer,
+                                               nullable=False,
+                                               default=0)
+
+    def to_dict(self):
+        return {
+            "gym_id": self.gym_id,
+            "day": self.day.isoformat(),
+            "payment_method": self.payment_method,
+            "status": self.status,
+            "total_amount": str(self.total_amount),
+            "payment_count": self.payment_count
+        }
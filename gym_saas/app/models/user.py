@@ -6,9 +6,9 @@ from datetime import datetime
 class User(db.Model):
     __tablename__ = "users"
 
-    id: Mapped[str] = mapped_column(db.String(50), primary_key=True)
+    id: Mapped[str] = mapped_column(db.Uuid(as_uuid=False), primary_key=True)
 
-    gym_id: Mapped[str] = mapped_column(db.String(50),
+    gym_id: Mapped[str] = mapped_column(db.Uuid(as_uuid=False),
                                         db.ForeignKey("gyms.id"),
                                         nullable=False,
                                         index=True)
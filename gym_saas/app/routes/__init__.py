@@ -1,5 +1,5 @@
 from flask import Blueprint
-from . import gym_auth, member, plans, membership, payment, dashboard, public
+from . import gym_auth, member, plans, membership, payment, dashboard, public, export, analytics
 
 api_v1 = Blueprint("api_v1", __name__, url_prefix="")
 
@@ -9,4 +9,6 @@ api_v1.register_blueprint(plans.plan_bp, url_prefix="/plan")
 api_v1.register_blueprint(membership.membership_bp, url_prefix="/membership")
 api_v1.register_blueprint(payment.payment_bp, url_prefix="/payment")
 api_v1.register_blueprint(dashboard.dashboard_bp, url_prefix="/dashboard")
+api_v1.register_blueprint(export.export_bp, url_prefix="/export")
+api_v1.register_blueprint(analytics.analytics_bp, url_prefix="/analytics")
 api_v1.register_blueprint(public.public_bp, url_prefix= "/")
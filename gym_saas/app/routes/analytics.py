@@ -0,0 +1,74 @@
+from datetime import date, timedelta
+from flask import Blueprint, request
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from gym_saas.app.services.analytics_service import AnalyticsService
+from gym_saas.app.services.cube_service import CUBE_DIMENSIONS, CubeService
+
+analytics_bp = Blueprint("analytics", __name__)
+
+
+@analytics_bp.route("/stats", methods=["GET"])
+@jwt_required()
+def membership_stats():
+    gym_id = get_jwt_identity()
+
+    stats, error = AnalyticsService.get_membership_stats(gym_id)
+    if error:
+        return {"error": error}, 400
+
+    return stats
+
+
+@analytics_bp.route("/revenue", methods=["GET"])
+@jwt_required()
+def revenue_series():
+    gym_id = get_jwt_identity()
+
+    # defaults to the last 30 days, one bucket per day
+    end = request.args.get("end") or date.today().isoformat()
+    start = request.args.get("start") or (
+        date.today() - timedelta(days=29)).isoformat()
+
+    series, error = AnalyticsService.get_revenue_series(
+        gym_id,
+        start,
+        end,
+        bucket=request.args.get("bucket", "day"),
+        group_by=request.args.get("group_by") or None)
+    if error:
+        return {"error": error}, 400
+
+    return series
+
+
+@analytics_bp.route("/cohorts", methods=["GET"])
+@jwt_required()
+def cohort_retention():
+    gym_id = get_jwt_identity()
+
+    report, error = AnalyticsService.get_cohort_retention(
+        gym_id, months=request.args.get("months", 12, type=int))
+    if error:
+        return {"error": error}, 400
+
+    return report
+
+
+@analytics_bp.route("/cube", methods=["GET"])
+@jwt_required()
+def revenue_cube():
+    gym_id = get_jwt_identity()
+
+    # ?group_by=plan,month&payment_method=cash&payment_method=upi
+    group_by = [d for d in request.args.get("group_by", "").split(",") if d]
+    filters = {
+        dim: [v for value in request.args.getlist(dim)
+              for v in value.split(",") if v]
+        for dim in CUBE_DIMENSIONS
+    }
+
+    report, error = CubeService.slice(gym_id, group_by, filters)
+    if error:
+        return {"error": error}, 400
+
+    return report
@@ -1,11 +1,15 @@
 from flask import Blueprint, render_template
-from flask_jwt_extended import jwt_required
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from gym_saas.app.services.analytics_service import AnalyticsService
 
 dashboard_bp = Blueprint("dashboard", __name__)
 
 @dashboard_bp.route("/", methods=["GET"])
 @jwt_required()
 def home():
+    gym_id = get_jwt_identity()
 
-    
-    return render_template("dashboard/home.html")
+    # cached snapshot; only rebuilt after a write or when the TTL runs out
+    kpis, _ = AnalyticsService.get_dashboard_kpis(gym_id)
+
+    return render_template("dashboard/home.html", kpis=kpis)
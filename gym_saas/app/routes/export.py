@@ -0,0 +1,24 @@
+from flask import Blueprint, Response, stream_with_context
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from gym_saas.app.services.export_service import ExportService
+
+export_bp = Blueprint("export", __name__)
+
+MIMETYPES = {"csv": "text/csv", "jsonl": "application/x-ndjson"}
+
+
+@export_bp.route("/<entity>.<fmt>", methods=["GET"])
+@jwt_required()
+def export(entity, fmt):
+    gym_id = get_jwt_identity()
+
+    chunks, error = ExportService.export_rows(gym_id, entity, fmt)
+    if error:
+        return {"error": error}, 400
+
+    return Response(
+        stream_with_context(chunks),
+        mimetype=MIMETYPES[fmt],
+        headers={
+            "Content-Disposition": f"attachment; filename={entity}.{fmt}"
+        })
@@ -1,9 +1,9 @@
+import csv
+import io
 from flask import Blueprint, render_template, request, redirect, url_for, flash
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from gym_saas.app.extensions import db
 from gym_saas.app.models import Membership
 from gym_saas.app.services.member_service import MemberService
-from gym_saas.app.services.membership_service import MembershipService
 from gym_saas.app.services.payment_service import PaymentService
 from gym_saas.app.services.plan_service import PlanService
 from gym_saas.app.utils.validation import validate_id
@@ -32,6 +32,24 @@ def create_member():
     flash("Member created successfully", "success")
     return redirect(url_for("api_v1.dashboard.home"))
 
+@member_bp.route("/import", methods=["POST"])
+@jwt_required()
+def import_members():
+    gym_id = get_jwt_identity()
+
+    upload = request.files.get("file")
+    if not upload:
+        return {"error": "CSV file is required"}, 400
+
+    # streamed straight from the upload, never read into memory at once
+    rows = csv.DictReader(io.TextIOWrapper(upload.stream, encoding="utf-8-sig"))
+
+    report, error = MemberService.import_members(gym_id, rows)
+    if error:
+        return {"error": error}, 400
+
+    return report
+
 @member_bp.route("/list", methods=["GET"])
 @jwt_required()
 def list_member():
@@ -58,12 +76,24 @@ def search_members():
     gym_id = get_jwt_identity()
     query = request.args.get("q", "").strip()
 
-    members, _, _ = MemberService.list_members(
-        gym_id,
-        page=1,
-        per_page=1000,  # large enough for search
-        search=query,
-    )
+    if query.isdigit():
+        members, error = MemberService.search_members_by_phone(
+            gym_id,
+            query,
+            limit=request.args.get("limit", 10, type=int),
+        )
+    elif query:
+        members, error = MemberService.search_members(
+            gym_id,
+            query,
+            limit=request.args.get("limit", 10, type=int),
+        )
+    else:
+        # cleared search box -> back to the first directory page
+        members, _, error = MemberService.list_members(gym_id, page=1)
+
+    if error:
+        return {"members": [], "error": error}, 400
 
     data = []
 
@@ -92,15 +122,14 @@ def member_details(member_id):
             flash(err or "Invalid ID", "error")
             return redirect(url_for("api_v1.member.list_member"))
 
-    # --- Member ---
-    member, error = MemberService.get_member(gym_id, member_id)
-    if error:
-        flash(error, "error")
-        return redirect(url_for("api_v1.member.list_member"))
-
     # --- CLEAR BALANCE (POST ONLY) ---
     if request.method == "POST" and request.form.get(
             "clear_balance") == "true":
+        member, error = MemberService.get_member(gym_id, member_id)
+        if error:
+            flash(error, "error")
+            return redirect(url_for("api_v1.member.list_member"))
+
         membership = Membership.query.filter_by(gym_id=gym_id,
                                                 member_id=member_id,
                                                 is_active=True).first()
@@ -118,51 +147,37 @@ def member_details(member_id):
             flash("No balance to clear", "info")
             return redirect(request.url)
 
-        # 🔐 Create payment for remaining balance
-        PaymentService.create_payment(gym_id=gym_id,
-                                      membership_id=membership.id,
-                                      amount=balance,
-                                      payment_method=request.form.get(
-                                          "payment_method", "cash"))
+        # 🔐 Create payment for remaining balance (single commit inside)
+        payment, error = PaymentService.create_payment(
+            gym_id=gym_id,
+            membership_id=membership.id,
+            amount=balance,
+            payment_method=request.form.get("payment_method", "cash"),
+            membership=membership)
 
-        db.session.commit()
+        if error:
+            flash(error, "error")
+            return redirect(request.url)
 
         flash("Balance cleared successfully", "success")
         return redirect(request.url)
 
-    # --- Memberships (READ ONLY) ---
-    memberships, error = MembershipService.list_active_memberships_for_member(
-        gym_id, member_id)
+    # --- Member, memberships and totals (READ ONLY) ---
+    overview, error = MemberService.get_member_overview(gym_id, member_id)
     if error:
         flash(error, "error")
         return redirect(url_for("api_v1.member.list_member"))
 
-    memberships = memberships or []
-
-    # --- Totals ---
-    overall_plan_total = 0
-    overall_paid = 0
-    overall_balance = 0
-
-    for m in memberships:
-        total_paid = PaymentService.get_total_paid_for_membership(gym_id, m.id)
-        plan_amount = m.plan.price
-
-        overall_plan_total += plan_amount
-        overall_paid += total_paid
-        overall_balance += max(plan_amount - total_paid, 0)
-
-    payments, _ = PaymentService.list_payments_by_member(gym_id, member_id)
     plans, _ = PlanService.list_plans(gym_id)
 
     return render_template("member/member_details.html",
-                           member=member,
-                           memberships=memberships,
-                           payments=payments or [],
+                           member=overview["member"],
+                           memberships=overview["memberships"],
+                           payments=overview["payments"] or [],
                            plans=plans,
-                           overall_plan_total=overall_plan_total,
-                           overall_paid=overall_paid,
-                           overall_balance=overall_balance)
+                           overall_plan_total=overview["overall_plan_total"],
+                           overall_paid=overview["overall_paid"],
+                           overall_balance=overview["overall_balance"])
 
 
 @member_bp.route("/<member_id>/update", methods=["POST"])
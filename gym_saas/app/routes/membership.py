@@ -3,6 +3,7 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from gym_saas.app.services.membership_service import MembershipService
 from gym_saas.app.services.payment_service import PaymentService
 from gym_saas.app.services.plan_service import PlanService
+from gym_saas.app.utils.transaction import TransactionAborted, unit_of_work
 from gym_saas.app.utils.validation import validate_id
 from decimal import Decimal, InvalidOperation
 
@@ -27,17 +28,6 @@ def create_membership():
 
     start_date = data.get("start_date")
 
-    membership, error = MembershipService.create_membership(
-        gym_id, member_id, plan_id, start_date)
-
-    if error:
-        flash(error, "error")
-        return redirect(url_for("api_v1.dashboard.home"))
-
-    if membership is None:
-        flash("Failed to create membership", "error")
-        return redirect(url_for("api_v1.dashboard.home"))
-
     plan, error = PlanService.get_plan(gym_id, plan_id)
     if error:
         flash(error, "error")
@@ -67,12 +57,24 @@ def create_membership():
         flash("Paid amount cannot exceed plan price", "error")
         return redirect(url_for("api_v1.dashboard.home"))
 
-    payment, error = PaymentService.create_payment(gym_id, membership.id,
-                                                   amount_paid, payment_method)
-
-    if error:
-        MembershipService.deactivate_membership(gym_id, membership.id)
-        flash(error, "error")
+    # membership and first payment commit together or not at all
+    try:
+        with unit_of_work():
+            membership, error = MembershipService.create_membership(
+                gym_id, member_id, plan_id, start_date)
+            if error:
+                raise TransactionAborted(error)
+
+            payment, error = PaymentService.create_payment(
+                gym_id, membership.id, amount_paid, payment_method,
+                membership=membership)
+            if error:
+                raise TransactionAborted(error)
+    except TransactionAborted as e:
+        flash(str(e), "error")
+        return redirect(url_for("api_v1.dashboard.home"))
+    except Exception:
+        flash("Failed to create membership", "error")
         return redirect(url_for("api_v1.dashboard.home"))
 
     flash("Membership created successfully", "success")
@@ -88,12 +90,31 @@ def list_membership():
         flash(err or "Invalid gym ID", "error")
         return redirect(url_for("api_v1.dashboard.home"))
 
-    memberships, error = MembershipService.list_active_memberships(gym_id)
+    filters = {
+        "status": request.args.get("status", "").strip() or None,
+        "expires_from": request.args.get("expires_from", "").strip() or None,
+        "expires_to": request.args.get("expires_to", "").strip() or None,
+    }
+    cursor = request.args.get("cursor") or None
+    per_page = request.args.get("per_page", 50, type=int)
+
+    memberships, next_cursor, error = MembershipService.list_memberships_page(
+        gym_id, cursor=cursor, per_page=per_page, **filters)
     if error:
         flash(error, "error")
         return redirect(url_for("api_v1.dashboard.home"))
 
-    return render_template("membership/list.html", memberships=memberships)
+    if request.args.get("format") == "json":
+        return {
+            "memberships": [m.to_dict() for m in memberships],
+            "next_cursor": next_cursor
+        }
+
+    return render_template("membership/list.html",
+                           memberships=memberships,
+                           next_cursor=next_cursor,
+                           cursor=cursor,
+                           filters=filters)
 
 
 @membership_bp.route("/<membership_id>/renew", methods=["POST"])
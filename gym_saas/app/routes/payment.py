@@ -1,6 +1,8 @@
-from flask import Blueprint, render_template, redirect, url_for, flash
+from flask import Blueprint, render_template, request, redirect, url_for, flash
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from gym_saas.app.services.payment_service import PaymentService
+from gym_saas.app.services.payment_service import (PAYMENT_METHODS,
+                                                   PAYMENT_STATUSES,
+                                                   PaymentService)
 from gym_saas.app.services.membership_service import MembershipService
 from gym_saas.app.utils.validation import validate_id
 
@@ -17,13 +19,55 @@ def list_payment():
         flash(err or "error")
         return redirect(url_for("api_v1.dashboard.home"))
 
-    payments, error = PaymentService.list_payments_by_gym(gym_id)
+    filters = {
+        "date_from": request.args.get("date_from", "").strip() or None,
+        "date_to": request.args.get("date_to", "").strip() or None,
+        "payment_method": request.args.get("payment_method", "").strip()
+        or None,
+        "status": request.args.get("status", "").strip() or None,
+        "membership_id": request.args.get("membership_id", "").strip()
+        or None,
+    }
+    cursor = request.args.get("cursor") or None
+    per_page = request.args.get("per_page", 50, type=int)
+
+    payments, next_cursor, error = PaymentService.list_payments_page(
+        gym_id, cursor=cursor, per_page=per_page, **filters)
 
     if error:
         flash(error, "error")
         return redirect(url_for("api_v1.dashboard.home"))
 
-    return render_template("payment/list.html", payments=payments)
+    if request.args.get("format") == "json":
+        return {
+            "payments": [p.to_dict() for p in payments],
+            "next_cursor": next_cursor
+        }
+
+    return render_template("payment/list.html",
+                           payments=payments,
+                           next_cursor=next_cursor,
+                           cursor=cursor,
+                           filters=filters,
+                           payment_methods=PAYMENT_METHODS,
+                           payment_statuses=PAYMENT_STATUSES)
+
+
+@payment_bp.route("/bulk", methods=["POST"])
+@jwt_required()
+def bulk_payments():
+    gym_id = get_jwt_identity()
+
+    data = request.get_json(silent=True) or {}
+    entries = data.get("payments")
+    if not isinstance(entries, list):
+        return {"error": "payments must be a list"}, 400
+
+    report, error = PaymentService.create_payments_bulk(gym_id, entries)
+    if error:
+        return {"error": error}, 400
+
+    return report
 
 
 @payment_bp.route("/<payment_id>/details", methods=["GET"])
@@ -48,7 +92,7 @@ def payment_details(payment_id):
         return redirect(url_for("api_v1.payment.list_payment"))
 
     membership, error = MembershipService.get_membership(
-        gym_id, payment.membership_id
+        gym_id, payment.membership_id, eager=True
     )
 
     if membership is None:
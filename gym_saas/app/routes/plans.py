@@ -71,12 +71,15 @@ def plan_details(plan_id):
         flash(error, "error")
         return redirect(url_for("api_v1.plan.list_plan"))
 
-    memberships, error = MembershipService.list_active_memberships(gym_id)
+    memberships, error = MembershipService.list_active_memberships(
+        gym_id, plan_id=plan_id, eager=True)
     if error:
         flash(error, "error")
         return redirect(url_for("api_v1.plan.list_plan"))
 
-    payments, error = PaymentService.list_payments_by_gym(gym_id)
+    payments, error = PaymentService.list_payments_by_plan(gym_id,
+                                                           plan_id,
+                                                           eager=True)
     if error:
         flash(error, "error")
         return redirect(url_for("api_v1.plan.list_plan"))
@@ -0,0 +1,24 @@
+import threading
+from gym_saas.app.extensions import db
+
+
+def start_membership_sweeper(app, interval):
+    from gym_saas.app.services.membership_service import MembershipService
+
+    stop = threading.Event()
+
+    def run():
+        while not stop.wait(interval):
+            with app.app_context():
+                try:
+                    MembershipService.sweep_all_gyms()
+                except Exception:
+                    app.logger.exception("Membership sweep failed")
+                finally:
+                    db.session.remove()
+
+    thread = threading.Thread(target=run,
+                              name="membership-sweeper",
+                              daemon=True)
+    thread.start()
+    return stop
@@ -1,50 +1,350 @@
-class AnalyticsService
+from gym_saas.app.extensions import db
+from gym_saas.app.models import Member, Membership, Payment, Plan, RevenueDaily
+from gym_saas.app.utils.validation import validate_id
+from gym_saas.app.utils.cache import TTLCache, VersionCounter
+from gym_saas.app.utils.transaction import after_commit
+from datetime import datetime, timedelta
+from decimal import Decimal
+from sqlalchemy import (DateTime, Integer, Interval, String, cast, extract,
+                        func, literal, select)
+
+# gym_id -> (version, day, kpis); the TTL bounds staleness across workers,
+# the version counter makes this worker's own writes show up immediately
+_dashboard_snapshots = TTLCache(ttl=60)
+_dashboard_versions = VersionCounter()
+
+SERIES_BUCKETS = {"day": 1, "week": 7, "month": 31}
+SERIES_GROUPS = ("payment_method", "plan")
+MAX_SERIES_BUCKETS = 1000
+
+# (gym_id, day, months) -> report; cohorts only move once a day
+_cohort_reports = TTLCache(ttl=6 * 60 * 60)
+MAX_COHORT_MONTHS = 24
+
+
+class AnalyticsService:
+
   @staticmethod
   def get_membership_stats(gym_id):
-     gym_id_valid, gym_id_err = validate_id(gym_id)
-     if not gym_id_valid:
-        return None, gym_id_err
-        # 🔹 Total Members
-     total_members = Member.query.filter_by(gym_id=gym_id).count()
-
-     # 🔹 Active Memberships
-     active_memberships = Membership.query.filter_by
-     (gym_id=gym_id, is_active=True).count()
-     # 🔹 Revenue
-     total_revenue = db.session.query(func.coalesce(func.sum(Payment.amount), 0)).filter_by(gym_id=gym_id).scalar()
-     # 🔹 Pending Payments
-     pending_payments = db.session.query(func.coalesce(func.sum(Membership.plan.price), 0)).filter
-     (Membership.gym_id == gym_id, Membership.is_active.is_(True)).scalar()
-     total_paid = db.session.query(func.coalesce(func.sum(Payment.amount), 0)).join(Membership).filter
-     (Membership.gym_id == gym_id, Membership.is_active.is_(True)).scalar()
-     pending_amount = pending_payments - total_paid
-     # return {
-     #    "total_members": total_members,
-     #    "active_memberships": active_memberships,
-     #    "total_revenue": total_revenue,
-     #    "pending_amount": pending_amount
-     # }
-     # 🔹 Membership Status Distribution
-     status_distribution = db.session.query(
-        Membership.status,
-        func.count(Membership.id)
-     ).filter_by(gym_id=gym_id).group_by(Membership.status).all()
-     status_distribution = {status: count for status, count in status_distribution}
-     # 🔹 Revenue by Plan
-     revenue_by_plan = db.session.query
-     (Plan.name, func.coalesce(func.sum(Payment.amount), 0)).join(Membership).join(Plan).filter
-     (Membership.gym_id == gym_id).group_by(Plan.name).all()
-     revenue_by_plan = {plan: amount for plan, amount in revenue_by_plan}
-     # 🔹 Membership Duration Distribution
-     duration_distribution = db.session.query
-     (Plan.duration_months, func.count(Membership.id)).join(Membership).filter
-     (Membership.gym_id == gym_id).group_by(Plan.duration_months).all()
-     duration_distribution = {duration: count for duration, count in duration_distribution}
-     return
-
-   @staticmethod
-   def get_membership_stats(gym_id):
-     gym_id_valid, gym_id_err = validate_id(gym_id)
-     if not gym_id_valid:
-        return None, gym_id_err
-       
\ No newline at end of file
+    gym_id_valid, gym_id_err = validate_id(gym_id)
+    if not gym_id_valid:
+      return None, gym_id_err
+
+    # 🔹 Paid amount per membership (one pass over payments)
+    paid = select(Payment.membership_id,
+                  func.sum(Payment.amount).label("amount")).where(
+                      Payment.gym_id == gym_id,
+                      Payment.status == "PAID").group_by(
+                          Payment.membership_id).cte("paid")
+
+    # 🔹 Every membership with its plan and paid amount (one pass)
+    memberships = select(
+        Membership.status, Membership.is_active,
+        Plan.name.label("plan_name"), Plan.price, Plan.duration_months,
+        func.coalesce(paid.c.amount, 0).label("paid")).join(
+            Plan, Plan.id == Membership.plan_id).outerjoin(
+                paid, paid.c.membership_id == Membership.id).where(
+                    Membership.gym_id == gym_id).cte("gym_memberships")
+
+    totals = select(
+        func.count().filter(
+            memberships.c.is_active.is_(True)).label("active_memberships"),
+        func.coalesce(func.sum(memberships.c.paid), 0).label("total_revenue"),
+        func.coalesce(
+            func.sum(func.greatest(memberships.c.price - memberships.c.paid,
+                                   0)).filter(
+                                       memberships.c.is_active.is_(True)),
+            0).label("pending_amount")).cte("totals")
+
+    by_status = select(memberships.c.status,
+                       func.count().label("n")).group_by(
+                           memberships.c.status).cte("by_status")
+
+    by_plan = select(memberships.c.plan_name,
+                     func.sum(memberships.c.paid).label("amount")).group_by(
+                         memberships.c.plan_name).cte("by_plan")
+
+    by_duration = select(memberships.c.duration_months,
+                         func.count().label("n")).group_by(
+                             memberships.c.duration_months).cte("by_duration")
+
+    total_members = select(func.count(
+        Member.id)).where(Member.gym_id == gym_id).scalar_subquery()
+
+    # amounts go through text so json keeps them exact
+    stmt = select(
+        total_members.label("total_members"),
+        totals.c.active_memberships,
+        totals.c.total_revenue,
+        totals.c.pending_amount,
+        select(func.json_object_agg(
+            by_status.c.status, by_status.c.n)).scalar_subquery().label(
+                "status_distribution"),
+        select(
+            func.json_object_agg(by_plan.c.plan_name, cast(
+                by_plan.c.amount, String))).scalar_subquery().label(
+                    "revenue_by_plan"),
+        select(
+            func.json_object_agg(
+                by_duration.c.duration_months,
+                by_duration.c.n)).scalar_subquery().label(
+                    "duration_distribution")).select_from(totals)
+
+    row = db.session.execute(stmt).one()
+
+    return {
+        "total_members": row.total_members,
+        "active_memberships": row.active_memberships,
+        "total_revenue": row.total_revenue,
+        "pending_amount": row.pending_amount,
+        "status_distribution": row.status_distribution or {},
+        "revenue_by_plan": {
+            plan: Decimal(amount)
+            for plan, amount in (row.revenue_by_plan or {}).items()
+        },
+        "duration_distribution": {
+            int(duration): count
+            for duration, count in (row.duration_distribution or {}).items()
+        }
+    }, None
+
+  @staticmethod
+  def get_revenue_series(gym_id,
+                         start_date,
+                         end_date,
+                         bucket="day",
+                         group_by=None):
+    gym_id_valid, gym_id_err = validate_id(gym_id)
+    if not gym_id_valid:
+      return None, gym_id_err
+
+    if bucket not in SERIES_BUCKETS:
+      return None, "Bucket must be day, week or month"
+
+    if group_by is not None and group_by not in SERIES_GROUPS:
+      return None, "Group by must be payment_method or plan"
+
+    try:
+      start = datetime.strptime(start_date, "%Y-%m-%d")
+      end = datetime.strptime(end_date, "%Y-%m-%d")
+    except (TypeError, ValueError):
+      return None, "Invalid date format. Use YYYY-MM-DD"
+
+    if end < start:
+      return None, "End date must not be before start date"
+
+    if (end - start).days // SERIES_BUCKETS[bucket] >= MAX_SERIES_BUCKETS:
+      return None, f"Range is too long for {bucket} buckets"
+
+    if group_by == "plan":
+      # plan lives on the membership, so this one reads payments directly
+      period = func.date_trunc(bucket, Payment.created_at)
+      totals = select(
+          period.label("bucket"), Plan.name.label("key"),
+          func.sum(Payment.amount).label("amount"),
+          func.count(Payment.id).label("count")).join(
+              Membership, Membership.id == Payment.membership_id).join(
+                  Plan, Plan.id == Membership.plan_id).where(
+                      Payment.gym_id == gym_id, Payment.status == "PAID",
+                      Payment.created_at >= start,
+                      Payment.created_at < end + timedelta(days=1)).group_by(
+                          period, Plan.name).cte("totals")
+    else:
+      # everything else comes from the daily rollup, at most one row per
+      # day and method
+      period = func.date_trunc(bucket, cast(RevenueDaily.day, DateTime))
+      if group_by == "payment_method":
+        key = RevenueDaily.payment_method
+        groups = (period, key)
+      else:
+        # a constant belongs in the select list only; Postgres rejects
+        # GROUP BY 'total'
+        key = literal("total")
+        groups = (period,)
+      totals = select(
+          period.label("bucket"), key.label("key"),
+          func.sum(RevenueDaily.total_amount).label("amount"),
+          func.sum(RevenueDaily.payment_count).label("count")).where(
+              RevenueDaily.gym_id == gym_id, RevenueDaily.status == "PAID",
+              RevenueDaily.day.between(start.date(),
+                                       end.date())).group_by(
+                                           *groups).cte("totals")
+
+    # 🔹 Gap filling: every bucket in range x every key seen in range
+    buckets = select(
+        func.generate_series(func.date_trunc(bucket, start),
+                             func.date_trunc(bucket, end),
+                             cast(literal(f"1 {bucket}"), Interval)).label(
+                                 "bucket")).cte("buckets")
+    keys = select(totals.c.key).distinct().cte("series_keys")
+
+    # left join keeps the empty buckets when nothing was paid in range
+    stmt = select(buckets.c.bucket, keys.c.key,
+                  func.coalesce(totals.c.amount, 0),
+                  func.coalesce(totals.c.count, 0)).select_from(
+                      buckets.outerjoin(keys, literal(True)).outerjoin(
+                          totals, (totals.c.bucket == buckets.c.bucket)
+                          & (totals.c.key == keys.c.key))).order_by(
+                              buckets.c.bucket, keys.c.key)
+
+    periods = []
+    series = {}
+    for period_start, key, amount, count in db.session.execute(stmt):
+      period = period_start.date().isoformat()
+      if not periods or periods[-1] != period:
+        periods.append(period)
+      if key is None:
+        continue
+      points = series.setdefault(key, {"amount": [], "count": []})
+      points["amount"].append(amount)
+      points["count"].append(count)
+
+    return {"bucket": bucket, "periods": periods, "series": series}, None
+
+  @staticmethod
+  def get_cohort_retention(gym_id, months=12):
+    gym_id_valid, gym_id_err = validate_id(gym_id)
+    if not gym_id_valid:
+      return None, gym_id_err
+
+    months = max(1, min(months, MAX_COHORT_MONTHS))
+    today = datetime.utcnow().date()
+
+    cache_key = (gym_id, today, months)
+    report = _cohort_reports.get(cache_key)
+    if report is not None:
+      return report, None
+
+    this_month = datetime(today.year, today.month, 1)
+    first_cohort = this_month
+    for _ in range(months):
+      first_cohort = (first_cohort - timedelta(days=1)).replace(day=1)
+
+    one_month = cast(literal("1 month"), Interval)
+
+    # 🔹 Members by join month, with the cohort size as a window count
+    cohort = func.date_trunc("month", Member.join_date)
+    cohort_members = select(
+        Member.id, cohort.label("cohort"),
+        func.count().over(partition_by=cohort).label("size")).where(
+            Member.gym_id == gym_id,
+            Member.join_date >= first_cohort).cte("cohort_members")
+
+    # 🔹 Every month each cohort member held a membership, clipped to the
+    # window between their cohort and this month, and cut short at an early
+    # cancellation (least() skips the NULL cancelled_at of live memberships)
+    covered = select(
+        cohort_members.c.id, cohort_members.c.cohort,
+        func.generate_series(
+            func.greatest(func.date_trunc("month", Membership.start_date),
+                          cohort_members.c.cohort),
+            func.least(func.date_trunc("month", Membership.end_date),
+                       func.date_trunc("month", Membership.cancelled_at),
+                       this_month), one_month).label("month")).join(
+                           Membership,
+                           Membership.member_id == cohort_members.c.id).where(
+                               Membership.gym_id == gym_id).cte("covered")
+
+    offset = cast(
+        (extract("year", covered.c.month) - extract("year", covered.c.cohort))
+        * 12 + extract("month", covered.c.month) -
+        extract("month", covered.c.cohort), Integer)
+
+    # renewals overlap, so count each member once per month offset
+    retained = select(covered.c.cohort, offset.label("offset"),
+                      func.count(covered.c.id.distinct()).label(
+                          "members")).where(offset.between(
+                              1, months)).group_by(covered.c.cohort,
+                                                   offset).cte("retained")
+
+    cohorts = select(cohort_members.c.cohort,
+                     cohort_members.c.size).distinct().cte("cohorts")
+
+    stmt = select(cohorts.c.cohort, cohorts.c.size, retained.c.offset,
+                  retained.c.members).select_from(
+                      cohorts.outerjoin(
+                          retained,
+                          retained.c.cohort == cohorts.c.cohort)).order_by(
+                              cohorts.c.cohort, retained.c.offset)
+
+    rows = {}
+    for cohort_start, size, month_offset, members in db.session.execute(stmt):
+      entry = rows.get(cohort_start)
+      if entry is None:
+        # offsets that have not happened yet stay None, not 0
+        elapsed = ((this_month.year - cohort_start.year) * 12 +
+                   this_month.month - cohort_start.month)
+        entry = rows[cohort_start] = {
+            "cohort": cohort_start.strftime("%Y-%m"),
+            "size": size,
+            "retention": [0.0 if k <= elapsed else None
+                          for k in range(1, months + 1)]
+        }
+      if month_offset is not None:
+        entry["retention"][month_offset - 1] = round(members / size, 4)
+
+    report = {"months": months, "cohorts": list(rows.values())}
+    _cohort_reports.set(cache_key, report)
+    return report, None
+
+  @staticmethod
+  def get_dashboard_kpis(gym_id):
+    gym_id_valid, gym_id_err = validate_id(gym_id)
+    if not gym_id_valid:
+      return None, gym_id_err
+
+    now = datetime.utcnow()
+    version = _dashboard_versions.get(gym_id)
+
+    snapshot = _dashboard_snapshots.get(gym_id)
+    if snapshot and snapshot[0] == version and snapshot[1] == now.date():
+      return snapshot[2], None
+
+    paid = select(func.coalesce(func.sum(Payment.amount), 0)).where(
+        Payment.membership_id == Membership.id).scalar_subquery()
+
+    # 🔹 One statement, four scalar subqueries, each on its own index
+    stmt = select(
+        select(func.count(Member.id)).where(
+            Member.gym_id == gym_id,
+            Member.is_active.is_(True)).scalar_subquery().label(
+                "active_members"),
+        select(func.count(Membership.id)).where(
+            Membership.gym_id == gym_id, Membership.is_active.is_(True),
+            Membership.status == "active",
+            Membership.end_date.between(now, now + timedelta(
+                days=7))).scalar_subquery().label("expiring_this_week"),
+        select(func.coalesce(func.sum(RevenueDaily.total_amount), 0)).where(
+            RevenueDaily.gym_id == gym_id, RevenueDaily.day == now.date(),
+            RevenueDaily.status == "PAID").scalar_subquery().label(
+                "todays_collections"),
+        select(func.coalesce(func.sum(func.greatest(Plan.price - paid, 0)),
+                             0)).select_from(Membership).join(
+                                 Plan, Plan.id == Membership.plan_id).where(
+                                     Membership.gym_id == gym_id,
+                                     Membership.is_active.is_(True)).
+        scalar_subquery().label("outstanding_dues"))
+
+    row = db.session.execute(stmt).one()
+    kpis = {
+        "active_members": row.active_members,
+        "expiring_this_week": row.expiring_this_week,
+        "todays_collections": row.todays_collections,
+        "outstanding_dues": row.outstanding_dues
+    }
+
+    # tagged with the version read before querying, so a write that lands
+    # mid-query makes the next read refresh
+    _dashboard_snapshots.set(gym_id, (version, now.date(), kpis))
+    return kpis, None
+
+  @staticmethod
+  def dashboard_version(gym_id):
+    # caches derived from this gym's payments and memberships tag their
+    # entries with it
+    return _dashboard_versions.get(gym_id)
+
+  @staticmethod
+  def invalidate_dashboard(gym_id):
+    # bumped only if the caller's transaction commits
+    after_commit(lambda: _dashboard_versions.bump(gym_id))
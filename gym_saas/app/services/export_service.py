@@ -0,0 +1,89 @@
+import csv
+import io
+import json
+from gym_saas.app.extensions import db
+from gym_saas.app.models import Member, Membership, Payment
+from gym_saas.app.utils.validation import validate_id
+from sqlalchemy import select
+
+EXPORT_BATCH_SIZE = 1000
+EXPORT_FORMATS = ("csv", "jsonl")
+
+EXPORTS = {
+    "members": (Member, [
+        "id", "name", "phone_number", "is_active", "join_date", "created_at"
+    ]),
+    "memberships": (Membership, [
+        "id", "member_id", "plan_id", "start_date", "end_date", "status",
+        "is_active", "created_at"
+    ]),
+    "payments": (Payment, [
+        "id", "membership_id", "amount", "payment_method", "status",
+        "paid_at", "created_at"
+    ]),
+}
+
+
+def _format_value(value):
+  if value is None:
+    return None
+  if hasattr(value, "isoformat"):
+    return value.isoformat()
+  if isinstance(value, (bool, int, str)):
+    return value
+  return str(value)
+
+
+def _stream(gym_id, entity, fmt):
+  model, columns = EXPORTS[entity]
+
+  stmt = select(*[getattr(model, c) for c in columns]).where(
+      model.gym_id == gym_id).order_by(model.created_at, model.id)
+
+  # plain column tuples over a server-side cursor: nothing accumulates in
+  # the identity map and only one batch is held in memory at a time
+  result = db.session.execute(stmt,
+                              execution_options={
+                                  "stream_results": True,
+                                  "yield_per": EXPORT_BATCH_SIZE
+                              })
+
+  buffer = io.StringIO()
+  writer = csv.writer(buffer)
+
+  if fmt == "csv":
+    writer.writerow(columns)
+    yield buffer.getvalue()
+
+  try:
+    for rows in result.partitions():
+      buffer.seek(0)
+      buffer.truncate()
+
+      for row in rows:
+        values = [_format_value(v) for v in row]
+        if fmt == "csv":
+          writer.writerow(values)
+        else:
+          buffer.write(json.dumps(dict(zip(columns, values))) + "\n")
+
+      yield buffer.getvalue()
+  finally:
+    result.close()
+
+
+class ExportService:
+
+  @staticmethod
+  def export_rows(gym_id, entity, fmt="csv"):
+    valid, err = validate_id(gym_id)
+    if not valid:
+      return None, err
+
+    if entity not in EXPORTS:
+      return None, "Unknown export"
+
+    if fmt not in EXPORT_FORMATS:
+      return None, "Unsupported export format"
+
+    return _stream(gym_id, entity, fmt), None
@@ -6,10 +6,17 @@ from gym_saas.app.utils.validation import (validate_email, validate_password,
                                            validate_phone_number,
                                            validate_name)
 from gym_saas.app.utils.generate_id import generate_id
+from gym_saas.app.utils.db_errors import constraint_name
+from gym_saas.app.utils.tenant import forget_gym
 from sqlalchemy.exc import IntegrityError
 import secrets
 from datetime import datetime
 
+GYM_UNIQUE_ERRORS = {
+    "gyms_email_key": "Email already exists",
+    "gyms_phone_number_key": "Phone number already exists",
+}
+
 
 class GymAuthService:
 
@@ -36,11 +43,6 @@ class GymAuthService:
         if not password_valid:
             return None, password_error
 
-        existing = Gym.query.filter((Gym.email == email)
-                                    | (Gym.phone_number == phone)).first()
-        if existing:
-            return None, "Email or phone number already exists"
-
         password_hash = bcrypt.generate_password_hash(password).decode("utf-8")
 
         try:
@@ -55,9 +57,12 @@ class GymAuthService:
             db.session.commit()
             return gym, None
 
-        except IntegrityError:
+        # gyms_email_key / gyms_phone_number_key catch duplicates
+        except IntegrityError as e:
             db.session.rollback()
-            return None, "Email or phone number already exists"
+            if constraint_name(e) in GYM_UNIQUE_ERRORS:
+                return None, "Email or phone number already exists"
+            return None, "Something went wrong. Please try again."
 
         except Exception as e:
             db.session.rollback()
@@ -103,7 +108,12 @@ class GymAuthService:
             return None, "Invalid session"
 
         new_access_token = create_access_token(
-            identity=gym.id, expires_delta=timedelta(minutes=15))
+            identity=gym.id,
+            additional_claims={
+                "gym_id": gym.id,
+                "is_active": gym.is_active
+            },
+            expires_delta=timedelta(minutes=15))
 
         return new_access_token, None
 
@@ -116,6 +126,8 @@ class GymAuthService:
         try:
             gym.is_active = False
             db.session.commit()
+            # tokens issued earlier still claim is_active; drop the cache
+            forget_gym(gym_id)
             return {"message": "Gym deleted successfully"}, None
 
         except Exception:
@@ -151,12 +163,6 @@ class GymAuthService:
             if not phone_valid:
                 return None, phone_error
 
-            phone_exists = Gym.query.filter(Gym.phone_number == phone_number,
-                                            Gym.id != gym_id).first()
-
-            if phone_exists:
-                return None, "Phone number already exists"
-
             gym.phone_number = phone_number
 
         if email:
@@ -165,21 +171,16 @@ class GymAuthService:
             if not email_valid:
                 return None, email_error
 
-            email_exists = Gym.query.filter(Gym.email == email, Gym.id
-                                            != gym_id).first()
-
-            if email_exists:
-                return None, "Email already exists"
-
             gym.email = email
 
         try:
             db.session.commit()
             return {"message": "Gym updated successfully"}, None
 
-        except IntegrityError:
+        except IntegrityError as e:
             db.session.rollback()
-            return None, "Email or phone number already exists"
+            return None, GYM_UNIQUE_ERRORS.get(
+                constraint_name(e), "Email or phone number already exists")
 
         except Exception:
             db.session.rollback()
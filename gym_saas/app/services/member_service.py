@@ -1,13 +1,154 @@
+import re
+from flask import current_app
 from gym_saas.app.extensions import db
-from gym_saas.app.models import Gym, Member
+from gym_saas.app.models import Member
 from gym_saas.app.utils.validation import validate_id, validate_name, validate_phone_number
 from gym_saas.app.utils.generate_id import generate_id
+from gym_saas.app.utils.tenant import gym_is_active
+from gym_saas.app.utils.cache import TTLCache
+from gym_saas.app.utils.pagination import estimate_count
+from gym_saas.app.utils.db_errors import constraint_name
 from sqlalchemy.exc import IntegrityError
 from typing import Optional
 from gym_saas.app.models import Membership
 from gym_saas.app.models import Payment
 from gym_saas.app.models import Plan
-from sqlalchemy import func
+from gym_saas.app.services.payment_service import PaymentService
+from gym_saas.app.services.analytics_service import AnalyticsService
+from sqlalchemy import func, select, true
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from datetime import datetime
+from sqlalchemy.orm import aliased
+
+MAX_SEARCH_RESULTS = 25
+IMPORT_BATCH_SIZE = 1000
+
+# per-gym {"total", "active"} member counts for unfiltered pagination
+_member_counts = TTLCache(ttl=300)
+
+
+def _bump_member_counts(gym_id, total=0, active=0):
+  _member_counts.update(
+      gym_id, lambda counts: {
+          "total": counts["total"] + total,
+          "active": counts["active"] + active
+      })
+
+
+def _escape_like(value):
+  return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _import_batch(gym_id, batch, report):
+  # batch: [(line, name, phone_number)], already validated row by row
+  phones = {phone for _, _, phone in batch if phone}
+  existing = set()
+  if phones:
+    existing = set(
+        db.session.scalars(
+            select(Member.phone_number).where(
+                Member.gym_id == gym_id, Member.phone_number.in_(phones))))
+
+  now = datetime.utcnow()
+  rows = []
+  lines = {}
+  seen = set()
+
+  for line, name, phone in batch:
+    if phone in existing:
+      report["errors"].append({
+          "line": line,
+          "error": "Member with this phone number already exists"
+      })
+      continue
+
+    if phone and phone in seen:
+      report["errors"].append({
+          "line": line,
+          "error": "Duplicate phone number in file"
+      })
+      continue
+
+    if phone:
+      seen.add(phone)
+
+    member_id = generate_id()
+    lines[member_id] = line
+    rows.append({
+        "id": member_id,
+        "gym_id": gym_id,
+        "name": name,
+        "phone_number": phone,
+        "is_active": True,
+        "created_at": now,
+        "join_date": now
+    })
+
+  if not rows:
+    return
+
+  # one multi-row INSERT; rows that lose a race on uq_member_phone_per_gym
+  # are skipped by the conflict clause and reported below
+  stmt = pg_insert(Member).values(rows).on_conflict_do_nothing(
+      index_elements=["gym_id", "phone_number"],
+      index_where=Member.phone_number.isnot(None)).returning(Member.id)
+
+  inserted = set(db.session.scalars(stmt))
+  AnalyticsService.invalidate_dashboard(gym_id)
+  db.session.commit()
+
+  for member_id, line in lines.items():
+    if member_id not in inserted:
+      report["errors"].append({
+          "line": line,
+          "error": "Member with this phone number already exists"
+      })
+
+  report["created"] += len(inserted)
+  _bump_member_counts(gym_id, total=len(inserted), active=len(inserted))
+
+
+def _with_balances(gym_id, members, *order_by):
+  # `members` is an aliased, already limited member set; each row gets its
+  # current membership if there is one, otherwise the most recent
+  total_paid = (select(func.coalesce(func.sum(
+      Payment.amount), 0)).where(Payment.membership_id ==
+                                 Membership.id).scalar_subquery())
+
+  latest_membership = (select(
+      Membership.plan_id,
+      total_paid.label("total_paid")).where(
+          Membership.member_id == members.id,
+          Membership.gym_id == gym_id).order_by(
+              Membership.is_active.desc(),
+              Membership.created_at.desc()).limit(1).lateral(
+                  "latest_membership"))
+
+  results = (db.session.query(
+      members, Plan.price,
+      latest_membership.c.total_paid).select_from(members).outerjoin(
+          latest_membership, true()).outerjoin(
+              Plan, Plan.id == latest_membership.c.plan_id).order_by(
+                  *order_by).all())
+
+  rows = []
+
+  for member, plan_price, total_paid in results:
+    if plan_price is not None:
+      plan_amount = plan_price
+      balance = plan_amount - total_paid
+    else:
+      plan_amount = 0
+      total_paid = 0
+      balance = 0
+
+    member.plan_amount = plan_amount
+    member.total_paid = total_paid
+    member.balance = balance
+
+    rows.append(member)
+
+  return rows
 
 
 class MemberService:
@@ -24,8 +165,7 @@ class MemberService:
     if not gym_id_valid:
       return None, gym_id_error
 
-    gym = Gym.query.filter_by(id=gym_id, is_active=True).first()
-    if not gym:
+    if not gym_is_active(gym_id):
       return None, "Gym does not exist"
 
     name_valid, name_error = validate_name(name)
@@ -37,85 +177,244 @@ class MemberService:
       if not phone_valid:
         return None, phone_error
 
-      existing_member = Member.query.filter(
-        Member.gym_id == gym_id,
-        Member.phone_number == phone_number
-      ).first()
-
-      if existing_member:
-          # inactive → reactivate
-          if not existing_member.is_active:
-            existing_member.is_active = True
-            db.session.commit()
-            return existing_member, "Reactivated inactive member"
-
-          # already active → prevent duplicate
-          return None, "Member with this phone number already exists"
+    member_id = generate_id()
 
     try:
-      member = Member(id=generate_id(),
-                      gym_id=gym_id,
-                      name=name,
-                      phone_number=phone_number or None)
-      db.session.add(member)
+      if not phone_number:
+        member = Member(id=member_id, gym_id=gym_id, name=name)
+        db.session.add(member)
+        AnalyticsService.invalidate_dashboard(gym_id)
+        db.session.commit()
+        _bump_member_counts(gym_id, total=1, active=1)
+        return member, None
+
+      # one statement: insert, reactivate an inactive duplicate, or return
+      # nothing when an active member already has this phone number
+      stmt = pg_insert(Member).values(id=member_id,
+                                      gym_id=gym_id,
+                                      name=name,
+                                      phone_number=phone_number)
+      stmt = stmt.on_conflict_do_update(
+          index_elements=["gym_id", "phone_number"],
+          index_where=Member.phone_number.isnot(None),
+          set_={"is_active": True},
+          where=Member.is_active.is_(False)).returning(Member)
+
+      member = db.session.scalars(
+          stmt, execution_options={"populate_existing": True}).first()
+      if member is None:
+        db.session.rollback()
+        return None, "Member with this phone number already exists"
+
+      # a conflicting row's id comes back when it was reactivated
+      reactivated = member.id != member_id
+      AnalyticsService.invalidate_dashboard(gym_id)
       db.session.commit()
+
+      # inactive → reactivate
+      if reactivated:
+        _bump_member_counts(gym_id, active=1)
+        return member, "Reactivated inactive member"
+
+      _bump_member_counts(gym_id, total=1, active=1)
       return member, None
 
     except IntegrityError:
       db.session.rollback()
       return None, "Phone number already exists"
 
-    except Exception as e:
+    except Exception:
       db.session.rollback()
-      return None, str(e)
+      current_app.logger.exception("Member create failed for gym %s", gym_id)
+      return None, "Something went wrong. Please try again."
 
   @staticmethod
-  def list_members(gym_id, page=1, per_page=20, search = None):
+  def import_members(gym_id, reader, batch_size=IMPORT_BATCH_SIZE):
+    # reader: a csv.DictReader over the uploaded file
+    gym_id_valid, gym_id_error = validate_id(gym_id)
+    if not gym_id_valid:
+      return None, gym_id_error
+
+    if not gym_is_active(gym_id):
+      return None, "Gym does not exist"
 
-    payment_subquery = (db.session.query(
-        Payment.membership_id,
-        func.coalesce(func.sum(Payment.amount),
-                      0).label("total_paid")).group_by(
-                          Payment.membership_id).subquery())
+    columns = {(f or "").strip().lower() for f in reader.fieldnames or []}
+    if "name" not in columns:
+      return None, "CSV header must include a name column"
 
-    base_query = (db.session.query(
-        Member, Membership, Plan,
-        func.coalesce(payment_subquery.c.total_paid, 0)).outerjoin(
-            Membership, Membership.member_id == Member.id).outerjoin(
-                Plan, Plan.id == Membership.plan_id).outerjoin(
-                    payment_subquery, payment_subquery.c.membership_id ==
-                    Membership.id).filter(Member.gym_id == gym_id))
+    report = {"created": 0, "errors": []}
+    batch = []
+
+    try:
+      for row in reader:
+        # the record's last physical line, so a quoted newline in one
+        # field doesn't shift the lines reported for later rows
+        line = reader.line_num
+        # extra unnamed columns come back under a None key, ignore them
+        row = {k.strip().lower(): (v or "").strip()
+               for k, v in row.items() if k is not None}
+        name = row.get("name", "")
+        phone_number = row.get("phone_number") or row.get("phone") or None
+
+        if not name:
+          report["errors"].append({"line": line, "error": "Name is required"})
+          continue
+
+        name_valid, name_error = validate_name(name)
+        if not name_valid:
+          report["errors"].append({"line": line, "error": name_error})
+          continue
+
+        if phone_number:
+          phone_valid, phone_error = validate_phone_number(phone_number)
+          if not phone_valid:
+            report["errors"].append({"line": line, "error": phone_error})
+            continue
+
+        batch.append((line, name, phone_number))
+
+        if len(batch) >= batch_size:
+          _import_batch(gym_id, batch, report)
+          batch = []
+
+      if batch:
+        _import_batch(gym_id, batch, report)
+
+    except Exception:
+      db.session.rollback()
+      current_app.logger.exception("Member import failed for gym %s", gym_id)
+      return None, (f"Import stopped after {report['created']} members. "
+                    "Please try again.")
+
+    report["failed"] = len(report["errors"])
+    return report, None
+
+  @staticmethod
+  def list_members(gym_id, page=1, per_page=20, search = None):
+
+    filters = [Member.gym_id == gym_id]
 
     if search:
-      base_query = base_query.filter(
+      filters.append(
           db.or_(
               Member.name.ilike(f"{search}%"),
               Member.phone_number.ilike(f"{search}%")
           )
       )
 
-    total = base_query.count()
+    # counted before any membership join, so each member counts once
+    if search:
+      total = estimate_count(Member.query.filter(*filters))
+    else:
+      total = MemberService.count_members(gym_id)["total"]
+
+    # page the members first, so balances are computed per page row only
+    page_members = aliased(
+        Member,
+        Member.query.filter(*filters).order_by(
+            Member.name, Member.id).limit(per_page).offset(
+                (page - 1) * per_page).subquery())
+
+    members = _with_balances(gym_id, page_members, page_members.name,
+                             page_members.id)
 
-    results = (base_query.limit(per_page).offset(
-        (page - 1) * per_page).all())
+    return members, total, None
 
-    members = []
+  @staticmethod
+  def search_members(gym_id, query, limit=10):
+    valid, err = validate_id(gym_id)
+    if not valid:
+      return None, err
+
+    query = (query or "").strip()
+    if not query:
+      return [], None
+
+    limit = max(1, min(limit, MAX_SEARCH_RESULTS))
+
+    # substring ILIKE and the trigram `%` operator are both served by the
+    # pg_trgm GIN index; rank by similarity and keep only the top N
+    similarity = func.similarity(Member.name, query)
+    ranked = aliased(
+        Member,
+        Member.query.filter(
+            Member.gym_id == gym_id,
+            db.or_(Member.name.ilike(f"%{_escape_like(query)}%"),
+                   Member.name.op("%")(query))).order_by(
+                       similarity.desc(), Member.name).limit(limit).subquery())
+
+    members = _with_balances(gym_id, ranked,
+                             func.similarity(ranked.name, query).desc(),
+                             ranked.name)
+
+    return members, None
 
-    for member, membership, plan, total_paid in results:
-      if membership and plan:
-        plan_amount = plan.price
-        balance = plan_amount - total_paid
-      else:
-        plan_amount = 0
-        balance = 0
+  @staticmethod
+  def search_members_by_phone_suffix(gym_id, digits, limit=10):
+    valid, err = validate_id(gym_id)
+    if not valid:
+      return None, err
 
-      member.plan_amount = plan_amount
-      member.total_paid = total_paid
-      member.balance = balance
+    digits = (digits or "").strip()
+    if not re.fullmatch(r"\d{1,10}", digits):
+      return None, "Phone suffix must be 1 to 10 digits"
 
-      members.append(member)
+    limit = max(1, min(limit, MAX_SEARCH_RESULTS))
 
-    return members, total, None
+    # reverse(phone) LIKE '<reversed digits>%' is an index prefix scan
+    matches = aliased(
+        Member,
+        Member.query.filter(
+            Member.gym_id == gym_id, Member.phone_number.isnot(None),
+            func.reverse(Member.phone_number).like(
+                digits[::-1] + "%")).order_by(
+                    Member.name, Member.id).limit(limit).subquery())
+
+    members = _with_balances(gym_id, matches, matches.name, matches.id)
+
+    return members, None
+
+  @staticmethod
+  def search_members_by_phone(gym_id, digits, limit=10):
+    digits = (digits or "").strip()
+    if not re.fullmatch(r"\d+", digits):
+      return None, "Phone search must be digits only"
+
+    # stored numbers are 10 digits, so a pasted number with a country code
+    # is matched on its last 10
+    members, err = MemberService.search_members_by_phone_suffix(
+        gym_id, digits[-10:], limit=limit)
+    if err:
+      return None, err
+
+    # then numbers that start with the digits, as the directory search does
+    limit = max(1, min(limit, MAX_SEARCH_RESULTS))
+    if len(members) < limit:
+      found = [m.id for m in members]
+      matches = aliased(
+          Member,
+          Member.query.filter(
+              Member.gym_id == gym_id,
+              Member.phone_number.like(digits + "%"),
+              Member.id.notin_(found)).order_by(
+                  Member.name, Member.id).limit(limit -
+                                                len(members)).subquery())
+      members += _with_balances(gym_id, matches, matches.name, matches.id)
+
+    return members, None
+
+  @staticmethod
+  def count_members(gym_id):
+    counts = _member_counts.get(gym_id)
+    if counts is None:
+      total, active = db.session.query(
+          func.count(Member.id),
+          func.count(Member.id).filter(Member.is_active.is_(True))).filter(
+              Member.gym_id == gym_id).one()
+      counts = {"total": total, "active": active}
+      _member_counts.set(gym_id, counts)
+
+    return counts
 
   @staticmethod
   def get_member(gym_id, member_id):
@@ -137,6 +436,64 @@ class MemberService:
 
     return member, None
 
+  @staticmethod
+  def get_member_overview(gym_id, member_id):
+    for value in [gym_id, member_id]:
+      valid, err = validate_id(value)
+      if not valid:
+        return None, err
+
+    total_paid = func.coalesce(func.sum(Payment.amount), 0)
+    balance = func.greatest(Plan.price - total_paid, 0)
+
+    # one row per active membership; grand totals ride along as windows
+    # over the grouped rows so the page needs a single round trip
+    rows = (db.session.query(
+        Member, Membership, Plan, total_paid,
+        func.sum(Plan.price).over(),
+        func.sum(total_paid).over(),
+        func.sum(balance).over()).outerjoin(
+            Membership,
+            db.and_(Membership.member_id == Member.id,
+                    Membership.gym_id == gym_id,
+                    Membership.is_active.is_(True))).outerjoin(
+                        Plan, Plan.id == Membership.plan_id).outerjoin(
+                            Payment,
+                            Payment.membership_id == Membership.id).filter(
+                                Member.id == member_id,
+                                Member.gym_id == gym_id).group_by(
+                                    Member.id, Membership.id,
+                                    Plan.id).all())
+
+    if not rows:
+      return None, "Member does not exist"
+
+    member = rows[0][0]
+    memberships = []
+
+    for _, membership, plan, paid, *_ in rows:
+      if membership is None:
+        continue
+
+      membership.total_paid = paid
+      membership.balance = max(plan.price - paid, 0)
+      memberships.append(membership)
+
+    payments, err = PaymentService.list_payments_by_member(gym_id, member_id)
+    if err:
+      return None, err
+
+    _, _, _, _, overall_plan_total, overall_paid, overall_balance = rows[0]
+
+    return {
+        "member": member,
+        "memberships": memberships,
+        "payments": payments,
+        "overall_plan_total": overall_plan_total or 0,
+        "overall_paid": overall_paid or 0,
+        "overall_balance": overall_balance or 0
+    }, None
+
   @staticmethod
   def update_member(gym_id,
                     member_id,
@@ -168,22 +525,18 @@ class MemberService:
       if not phone_valid:
         return None, phone_error
 
-      phone_exists = Member.query.filter(Member.phone_number == phone_number,
-                                         Member.gym_id == gym_id, Member.id
-                                         != member_id).first()
-
-      if phone_exists:
-        return None, "Phone number already exists"
-
       member.phone_number = phone_number
 
+    # uq_member_phone_per_gym rejects a phone number taken by another member
     try:
       db.session.commit()
       return member, None
 
-    except IntegrityError:
+    except IntegrityError as e:
       db.session.rollback()
-      return None, "Phone number already exists"
+      if constraint_name(e) == "uq_member_phone_per_gym":
+        return None, "Phone number already exists"
+      return None, "Something went wrong. Please try again."
 
     except Exception:
       db.session.rollback()
@@ -213,10 +566,14 @@ class MemberService:
                               Membership.is_active.is_(True)).update(
                                   {
                                       Membership.is_active: False,
-                                      Membership.status: "cancelled"
+                                      Membership.status: "cancelled",
+                                      Membership.cancelled_at:
+                                      datetime.utcnow()
                                   },
                                   synchronize_session=False)
+      AnalyticsService.invalidate_dashboard(gym_id)
       db.session.commit()
+      _bump_member_counts(gym_id, active=-1)
       return member, None
 
     except Exception:
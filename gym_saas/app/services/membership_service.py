@@ -1,13 +1,54 @@
 import decimal
+from contextlib import contextmanager
 from gym_saas.app.extensions import db
-from gym_saas.app.models import Membership, Member, Plan
+from gym_saas.app.models import Gym, Membership, Member, Plan
+from gym_saas.app.models.membership import STATUS_RANK
 from gym_saas.app.services.payment_service import PaymentService
+from gym_saas.app.services.analytics_service import AnalyticsService
 from gym_saas.app.utils.validation import validate_id, validate_price
 from gym_saas.app.utils.generate_id import generate_id
+from gym_saas.app.utils.pagination import encode_cursor, decode_cursor
+from gym_saas.app.utils.db_errors import constraint_name
+from gym_saas.app.utils.transaction import (TransactionAborted,
+                                            commit_or_flush, rollback_or_defer,
+                                            unit_of_work)
 from dateutil.relativedelta import relativedelta
 from datetime import datetime, timedelta
 from decimal import Decimal
-from sqlalchemy import case
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload, selectinload
+
+GRACE_PERIOD = timedelta(days=3)
+MAX_PAGE_SIZE = 100
+
+# Postgres advisory lock key: only one process sweeps at a time
+SWEEP_LOCK_KEY = 0x5EE9
+SWEEP_RUNNING = "A membership sweep is already running"
+
+
+@contextmanager
+def _sweep_lock():
+  # held on its own connection, since the sweep commits once per gym;
+  # workers and cron runs that lose the race skip this round
+  with db.engine.connect() as lock:
+    acquired = lock.scalar(select(func.pg_try_advisory_lock(SWEEP_LOCK_KEY)))
+    try:
+      yield acquired
+    finally:
+      if acquired:
+        lock.scalar(select(func.pg_advisory_unlock(SWEEP_LOCK_KEY)))
+
+
+def _with_member_and_plan(query, plan_strategy=selectinload):
+  # templates only read a handful of member and plan columns; plans repeat
+  # across rows, so select-in fetches each one once
+  return query.options(
+      joinedload(Membership.member).load_only(Member.id, Member.name,
+                                              Member.phone_number),
+      plan_strategy(Membership.plan).load_only(Plan.id, Plan.name,
+                                               Plan.price,
+                                               Plan.duration_months))
 
 
 class MembershipService:
@@ -33,13 +74,6 @@ class MembershipService:
     if not plan:
       return None, "Plan does not exist"
 
-    # 🔒 Prevent multiple active memberships
-    active = Membership.query.filter(Membership.member_id == member_id,
-                                     Membership.gym_id == gym_id,
-                                     Membership.is_active.is_(True)).first()
-    if active:
-      return None, "Member already has an active membership"
-
     # 📅 Parse start date
     if start_date:
       try:
@@ -66,12 +100,19 @@ class MembershipService:
                             status=status,
                             is_active=True)
 
+    # 🔒 uq_membership_active_per_member prevents multiple active memberships
     try:
       db.session.add(membership)
-      db.session.commit()
+      AnalyticsService.invalidate_dashboard(gym_id)
+      commit_or_flush()
       return membership, None
+    except IntegrityError as e:
+      rollback_or_defer()
+      if constraint_name(e) == "uq_membership_active_per_member":
+        return None, "Member already has an active membership"
+      return None, "Failed to create membership"
     except Exception:
-      db.session.rollback()
+      rollback_or_defer()
       return None, "Failed to create membership"
 
   @staticmethod
@@ -103,6 +144,7 @@ class MembershipService:
     # auto-expire when end_date is crossed
     if membership.status == "active" and now >= membership.end_date:
       membership.status = "expired"
+      AnalyticsService.invalidate_dashboard(gym_id)
       db.session.commit()
       return None, "Membership expired"
 
@@ -126,88 +168,164 @@ class MembershipService:
                          status="active",
                          is_active=True)
 
+    # payment is validated against the objects loaded above and the whole
+    # renewal goes out in a single commit
     try:
-      membership.is_active = False
-      membership.status = "cancelled"
+      with unit_of_work():
+        membership.is_active = False
+        membership.status = "cancelled"
+        membership.cancelled_at = now
+
+        db.session.add(renewed)
+        AnalyticsService.invalidate_dashboard(gym_id)
+
+        # 🔐 PAYMENT LOGIC (balance-aware)
+        if amount is None:
+          amount = plan.price  # default full price
+
+        if amount > 0:
+          # 🔐 Create payment for the renewed membership
+          payment, error = PaymentService.create_payment(
+              gym_id=gym_id,
+              membership_id=renewed.id,
+              amount=Decimal(amount),
+              payment_method=payment_method,
+              membership=renewed)
+          if error:
+            raise TransactionAborted(error)
 
-      db.session.add(renewed)
-      db.session.flush()  # 🔑 IMPORTANT
-
-      # 🔐 PAYMENT LOGIC (balance-aware)
-      if amount is None:
-        amount = plan.price  # default full price
-
-      if amount > 0:
-        # 🔐 Create payment for the renewed membership
-        amount = Decimal(amount)
-        PaymentService.create_payment(gym_id=gym_id,
-                                      membership_id=renewed.id,
-                                      amount=amount,
-                                      payment_method=payment_method)
-
-      db.session.commit()
       return renewed, None
 
+    except TransactionAborted as e:
+      return None, str(e)
     except Exception:
-      db.session.rollback()
       return None, "Renewal failed"
 
   @staticmethod
-  def list_active_memberships(gym_id):
+  def list_active_memberships(gym_id, plan_id=None, eager=False):
     valid, err = validate_id(gym_id)
     if not valid:
       return None, err
 
-    status_order = case((Membership.status == "expired", 1),
-                        (Membership.status == "active", 2),
-                        (Membership.status == "cancelled", 3),
-                        else_=4)
+    # statuses are kept current by the sweeper, listing stays read-only
+    query = Membership.query.filter(Membership.gym_id == gym_id)
 
-    memberships = Membership.query.filter(
-        Membership.gym_id == gym_id).order_by(status_order).all()
+    if plan_id:
+      valid, err = validate_id(plan_id)
+      if not valid:
+        return None, err
+      query = query.filter(Membership.plan_id == plan_id)
 
-    updated = False
-    for m in memberships:
-      if MembershipService.sync_membership_status(m):
-        updated = True
+    if eager:
+      query = _with_member_and_plan(query)
 
-    if updated:
-      db.session.commit()
+    memberships = query.order_by(Membership.status_rank).all()
 
     return memberships, None
 
   @staticmethod
-  def list_active_memberships_for_member(gym_id, member_id):
+  def list_memberships_page(gym_id,
+                            status=None,
+                            expires_from=None,
+                            expires_to=None,
+                            cursor=None,
+                            per_page=50):
+    valid, err = validate_id(gym_id)
+    if not valid:
+      return None, None, err
+
+    per_page = max(1, min(per_page, MAX_PAGE_SIZE))
+
+    query = Membership.query.filter(Membership.gym_id == gym_id)
+
+    if status:
+      if status not in STATUS_RANK:
+        return None, None, "Invalid membership status"
+      # filter on the rank so the (gym_id, status_rank, end_date, id)
+      # index serves both the filter and the ordering
+      query = query.filter(Membership.status_rank == STATUS_RANK[status])
+
+    try:
+      if expires_from:
+        query = query.filter(
+            Membership.end_date >= datetime.strptime(expires_from, "%Y-%m-%d"))
+      if expires_to:
+        query = query.filter(Membership.end_date < datetime.strptime(
+            expires_to, "%Y-%m-%d") + timedelta(days=1))
+    except ValueError:
+      return None, None, "Invalid date format. Use YYYY-MM-DD"
+
+    if cursor:
+      values, err = decode_cursor(cursor, 3)
+      if err:
+        return None, None, err
+
+      rank, end_date, membership_id = values
+      try:
+        rank = int(rank)
+        end_date = datetime.fromisoformat(end_date)
+      except (TypeError, ValueError):
+        return None, None, "Invalid cursor"
+
+      valid, _ = validate_id(str(membership_id))
+      if not valid:
+        return None, None, "Invalid cursor"
+
+      query = query.filter(
+          tuple_(Membership.status_rank, Membership.end_date, Membership.id)
+          > tuple_(rank,
+                   end_date,
+                   membership_id,
+                   types=(Membership.status_rank.type, Membership.end_date.type,
+                          Membership.id.type)))
+
+    rows = _with_member_and_plan(query).order_by(
+        Membership.status_rank, Membership.end_date,
+        Membership.id).limit(per_page + 1).all()
+
+    memberships = rows[:per_page]
+    next_cursor = None
+    if len(rows) > per_page:
+      last = memberships[-1]
+      next_cursor = encode_cursor(last.status_rank,
+                                  last.end_date.isoformat(), last.id)
+
+    return memberships, next_cursor, None
+
+  @staticmethod
+  def list_active_memberships_for_member(gym_id, member_id, eager=False):
     for value in [gym_id, member_id]:
       valid, err = validate_id(value)
       if not valid:
         return [], err
 
-    memberships = Membership.query.filter(
+    query = Membership.query.filter(
         Membership.gym_id == gym_id,
         Membership.member_id == member_id,
         Membership.is_active.is_(True),
-    ).all()
+    )
 
-    updated = False
-    for m in memberships:
-      if MembershipService.sync_membership_status(m):
-        updated = True
+    if eager:
+      query = _with_member_and_plan(query)
 
-    if updated:
-      db.session.commit()
+    memberships = query.all()
 
     return memberships, None
 
   @staticmethod
-  def get_membership(gym_id, membership_id):
+  def get_membership(gym_id, membership_id, eager=False):
     for value in [gym_id, membership_id]:
       valid, err = validate_id(value)
       if not valid:
         return None, err
 
-    membership = Membership.query.filter(Membership.id == membership_id,
-                                         Membership.gym_id == gym_id).first()
+    query = Membership.query.filter(Membership.id == membership_id,
+                                    Membership.gym_id == gym_id)
+
+    if eager:
+      query = _with_member_and_plan(query, plan_strategy=joinedload)
+
+    membership = query.first()
 
     if not membership:
       return None, "Membership not found"
@@ -237,18 +355,92 @@ class MembershipService:
 
     membership.is_active = False
     membership.status = "cancelled"
+    membership.cancelled_at = datetime.utcnow()
 
     try:
+      AnalyticsService.invalidate_dashboard(gym_id)
       db.session.commit()
       return membership, None
     except Exception:
       db.session.rollback()
       return None, "Something went wrong. Please try again."
 
+  @staticmethod
+  def sweep_membership_statuses(gym_id, now=None):
+    valid, err = validate_id(gym_id)
+    if not valid:
+      return None, err
+
+    now = now or datetime.utcnow()
+
+    try:
+      # is_active lets both updates use ix_memberships_gym_end_date_active;
+      # active and expired memberships are always still is_active
+
+      # 🔹 Active → Expired (grace starts)
+      expired = Membership.query.filter(
+          Membership.gym_id == gym_id, Membership.is_active.is_(True),
+          Membership.status == "active",
+          Membership.end_date <= now).update(
+              {Membership.status: "expired"}, synchronize_session=False)
+
+      # 🔹 Expired → Cancelled (grace over)
+      cancelled = Membership.query.filter(
+          Membership.gym_id == gym_id, Membership.is_active.is_(True),
+          Membership.status == "expired",
+          Membership.end_date < now - GRACE_PERIOD).update(
+              {
+                  Membership.status: "cancelled",
+                  Membership.is_active: False,
+                  Membership.cancelled_at: now
+              },
+              synchronize_session=False)
+
+      AnalyticsService.invalidate_dashboard(gym_id)
+      db.session.commit()
+      return {"expired": expired, "cancelled": cancelled}, None
+    except Exception:
+      db.session.rollback()
+      return None, "Something went wrong. Please try again."
+
+  @staticmethod
+  def sweep_gym(gym_id, now=None):
+    with _sweep_lock() as acquired:
+      if not acquired:
+        return None, SWEEP_RUNNING
+      return MembershipService.sweep_membership_statuses(gym_id, now)
+
+  @staticmethod
+  def sweep_all_gyms(now=None):
+    now = now or datetime.utcnow()
+
+    with _sweep_lock() as acquired:
+      if not acquired:
+        return None, SWEEP_RUNNING
+
+      gym_ids = [
+          gym_id for gym_id, in db.session.query(Gym.id).filter(
+              Gym.is_active.is_(True)).all()
+      ]
+
+      totals = {"gyms": 0, "expired": 0, "cancelled": 0}
+      for gym_id in gym_ids:
+        # one short transaction per gym keeps row locks brief
+        result, error = MembershipService.sweep_membership_statuses(
+            gym_id, now)
+        if error:
+          return None, error
+
+        totals["gyms"] += 1
+        totals["expired"] += result["expired"]
+        totals["cancelled"] += result["cancelled"]
+
+      return totals, None
+
   @staticmethod
   def sync_membership_status(membership):
     now = datetime.utcnow()
-    grace_deadline = membership.end_date + timedelta(days=3)
+    grace_deadline = membership.end_date + GRACE_PERIOD
 
     updated = False
 
@@ -261,6 +453,7 @@ class MembershipService:
     if membership.status == "expired" and now > grace_deadline:
       membership.status = "cancelled"
       membership.is_active = False
+      membership.cancelled_at = now
       updated = True
 
     return updated
@@ -1,16 +1,53 @@
 from gym_saas.app.extensions import db
-from gym_saas.app.models import Membership, Gym, Payment
+from gym_saas.app.models import Membership, Payment, Plan, RevenueDaily
+from gym_saas.app.services.analytics_service import AnalyticsService
 from gym_saas.app.utils.validation import validate_id
 from gym_saas.app.utils.generate_id import generate_id
+from gym_saas.app.utils.tenant import gym_is_active
+from gym_saas.app.utils.pagination import encode_cursor, decode_cursor
+from gym_saas.app.utils.transaction import commit_or_flush, rollback_or_defer
+from datetime import datetime, timedelta
 from decimal import Decimal, InvalidOperation
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import func
+from sqlalchemy import func, tuple_, cast, select, insert, Date
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import contains_eager, joinedload
+
+# straight from the Postgres enums, so a value the database would reject
+# never gets past validation
+PAYMENT_METHODS = tuple(Payment.__table__.c.payment_method.type.enums)
+PAYMENT_STATUSES = tuple(Payment.__table__.c.status.type.enums)
+MAX_PAGE_SIZE = 100
+MAX_BULK_PAYMENTS = 500
+
+
+def _record_revenue(gym_id, day, payment_method, status, amount, count=1):
+  # runs inside the caller's transaction so the rollup commits with the payment
+  stmt = pg_insert(RevenueDaily).values(gym_id=gym_id,
+                                        day=day,
+                                        payment_method=payment_method,
+                                        status=status,
+                                        total_amount=amount,
+                                        payment_count=count)
+  db.session.execute(
+      stmt.on_conflict_do_update(
+          index_elements=["gym_id", "day", "payment_method", "status"],
+          set_={
+              "total_amount":
+              RevenueDaily.total_amount + stmt.excluded.total_amount,
+              "payment_count":
+              RevenueDaily.payment_count + stmt.excluded.payment_count
+          }))
 
 
 class PaymentService:
 
   @staticmethod
-  def create_payment(gym_id, membership_id, amount, payment_method):
+  def create_payment(gym_id,
+                     membership_id,
+                     amount,
+                     payment_method,
+                     membership=None):
     if not all([gym_id, membership_id, payment_method]):
       return None, "All fields are required"
 
@@ -19,13 +56,19 @@ class PaymentService:
       if not valid:
         return None, err
 
-    gym = Gym.query.filter_by(id=gym_id, is_active=True).first()
-    if not gym:
-      return None, "Gym does not exist"
+    if membership is None:
+      if not gym_is_active(gym_id):
+        return None, "Gym does not exist"
+
+      membership = Membership.query.filter(
+          Membership.id == membership_id, Membership.gym_id == gym_id,
+          Membership.is_active.is_(True)).first()
+
+    # an already-loaded membership is checked in memory, no re-query
+    elif (membership.id != membership_id or membership.gym_id != gym_id
+          or not membership.is_active):
+      membership = None
 
-    membership = Membership.query.filter(
-        Membership.id == membership_id, Membership.gym_id == gym_id,
-        Membership.is_active.is_(True)).first()
     if not membership:
       return None, "Membership does not exist"
 
@@ -37,27 +80,141 @@ class PaymentService:
     if amount <= 0:
       return None, "Amount must be greater than zero"
 
-    if payment_method not in {"cash", "upi", "card"}:
+    if payment_method not in PAYMENT_METHODS:
       return None, "Invalid payment method"
 
+    now = datetime.utcnow()
     payment = Payment(id=generate_id(),
                       gym_id=gym_id,
                       membership_id=membership_id,
                       amount=amount,
                       payment_method=payment_method,
-                      status="PAID")
+                      status="PAID",
+                      paid_at=now,
+                      created_at=now)
 
     try:
       db.session.add(payment)
-      db.session.commit()
+      _record_revenue(gym_id, now.date(), payment_method, payment.status,
+                      amount)
+      AnalyticsService.invalidate_dashboard(gym_id)
+      commit_or_flush()
       return payment, None
     except IntegrityError:
-      db.session.rollback()
+      rollback_or_defer()
       return None, "Payment could not be processed"
     except Exception:
-      db.session.rollback()
+      rollback_or_defer()
       return None, "Something went wrong. Please try again."
 
+  @staticmethod
+  def create_payments_bulk(gym_id, entries):
+    valid, err = validate_id(gym_id)
+    if not valid:
+      return None, err
+
+    if not entries:
+      return None, "No payments given"
+
+    if len(entries) > MAX_BULK_PAYMENTS:
+      return None, f"At most {MAX_BULK_PAYMENTS} payments per request"
+
+    if not gym_is_active(gym_id):
+      return None, "Gym does not exist"
+
+    results = [None] * len(entries)
+    pending = []
+
+    for index, entry in enumerate(entries):
+      entry = entry if isinstance(entry, dict) else {}
+      membership_id = entry.get("membership_id")
+      payment_method = entry.get("payment_method")
+
+      if not isinstance(membership_id, str) or not membership_id:
+        results[index] = {"index": index, "error": "Membership ID is required"}
+        continue
+
+      valid, err = validate_id(membership_id)
+      if not valid:
+        results[index] = {"index": index, "error": err}
+        continue
+
+      try:
+        amount = Decimal(str(entry.get("amount")))
+      except (InvalidOperation, TypeError):
+        results[index] = {"index": index, "error": "Invalid amount format"}
+        continue
+
+      if not amount.is_finite() or amount <= 0:
+        results[index] = {
+            "index": index,
+            "error": "Amount must be greater than zero"
+        }
+        continue
+
+      if payment_method not in PAYMENT_METHODS:
+        results[index] = {"index": index, "error": "Invalid payment method"}
+        continue
+
+      pending.append((index, membership_id, amount, payment_method))
+
+    # one IN query validates every referenced membership
+    active_ids = set()
+    if pending:
+      active_ids = {
+          membership_id
+          for membership_id, in db.session.query(Membership.id).filter(
+              Membership.gym_id == gym_id, Membership.is_active.is_(True),
+              Membership.id.in_({p[1]
+                                 for p in pending})).all()
+      }
+
+    now = datetime.utcnow()
+    rows = []
+    totals = {}
+    for index, membership_id, amount, payment_method in pending:
+      if membership_id not in active_ids:
+        results[index] = {"index": index, "error": "Membership does not exist"}
+        continue
+
+      payment_id = generate_id()
+      rows.append({
+          "id": payment_id,
+          "gym_id": gym_id,
+          "membership_id": membership_id,
+          "amount": amount,
+          "payment_method": payment_method,
+          "status": "PAID",
+          "paid_at": now,
+          "created_at": now
+      })
+      total, count = totals.get(payment_method, (Decimal("0"), 0))
+      totals[payment_method] = (total + amount, count + 1)
+      results[index] = {
+          "index": index,
+          "membership_id": membership_id,
+          "payment_id": payment_id
+      }
+
+    if rows:
+      try:
+        # executemany is batched into multi-row INSERT ... VALUES statements
+        db.session.execute(insert(Payment), rows)
+        for payment_method, (total, count) in totals.items():
+          _record_revenue(gym_id, now.date(), payment_method, "PAID", total,
+                          count)
+        AnalyticsService.invalidate_dashboard(gym_id)
+        commit_or_flush()
+      except Exception:
+        rollback_or_defer()
+        return None, "Payments could not be processed"
+
+    return {
+        "created": len(rows),
+        "failed": len(entries) - len(rows),
+        "results": results
+    }, None
+
   @staticmethod
   def list_payments_by_gym(gym_id):
     valid, err = validate_id(gym_id)
@@ -69,6 +226,83 @@ class PaymentService:
 
     return payments, None
 
+  @staticmethod
+  def list_payments_page(gym_id,
+                         date_from=None,
+                         date_to=None,
+                         payment_method=None,
+                         status=None,
+                         membership_id=None,
+                         cursor=None,
+                         per_page=50):
+    valid, err = validate_id(gym_id)
+    if not valid:
+      return None, None, err
+
+    per_page = max(1, min(per_page, MAX_PAGE_SIZE))
+
+    query = Payment.query.filter(Payment.gym_id == gym_id)
+
+    try:
+      if date_from:
+        query = query.filter(
+            Payment.created_at >= datetime.strptime(date_from, "%Y-%m-%d"))
+      if date_to:
+        query = query.filter(Payment.created_at < datetime.strptime(
+            date_to, "%Y-%m-%d") + timedelta(days=1))
+    except ValueError:
+      return None, None, "Invalid date format. Use YYYY-MM-DD"
+
+    if payment_method:
+      if payment_method not in PAYMENT_METHODS:
+        return None, None, "Invalid payment method"
+      query = query.filter(Payment.payment_method == payment_method)
+
+    if status:
+      if status not in PAYMENT_STATUSES:
+        return None, None, "Invalid payment status"
+      query = query.filter(Payment.status == status)
+
+    if membership_id:
+      valid, err = validate_id(membership_id)
+      if not valid:
+        return None, None, err
+      query = query.filter(Payment.membership_id == membership_id)
+
+    if cursor:
+      values, err = decode_cursor(cursor, 2)
+      if err:
+        return None, None, err
+
+      created_at, payment_id = values
+      try:
+        created_at = datetime.fromisoformat(created_at)
+      except (TypeError, ValueError):
+        return None, None, "Invalid cursor"
+
+      valid, _ = validate_id(str(payment_id))
+      if not valid:
+        return None, None, "Invalid cursor"
+
+      # newest first, so the next page holds the smaller tuples; the cursor
+      # values are bound with the column types, as a plain comparison would
+      query = query.filter(
+          tuple_(Payment.created_at, Payment.id) < tuple_(
+              created_at,
+              payment_id,
+              types=(Payment.created_at.type, Payment.id.type)))
+
+    rows = query.order_by(Payment.created_at.desc(),
+                          Payment.id.desc()).limit(per_page + 1).all()
+
+    payments = rows[:per_page]
+    next_cursor = None
+    if len(rows) > per_page:
+      last = payments[-1]
+      next_cursor = encode_cursor(last.created_at.isoformat(), last.id)
+
+    return payments, next_cursor, None
+
   @staticmethod
   def list_payments_by_member(gym_id, member_id):
     for value in [gym_id, member_id]:
@@ -83,15 +317,22 @@ class PaymentService:
     return payments, None
 
   @staticmethod
-  def list_payments_by_plan(gym_id, plan_id):
+  def list_payments_by_plan(gym_id, plan_id, eager=False):
     for value in [gym_id, plan_id]:
       valid, err = validate_id(value)
       if not valid:
         return None, err
 
-    payments = Payment.query.join(Membership).filter(
-        Membership.plan_id == plan_id,
-        Payment.gym_id == gym_id).order_by(Payment.created_at.desc()).all()
+    query = Payment.query.join(Membership).filter(
+        Membership.plan_id == plan_id, Payment.gym_id == gym_id)
+
+    if eager:
+      # reuse the membership join instead of a lazy load per payment
+      query = query.options(
+          contains_eager(Payment.membership).joinedload(
+              Membership.plan).load_only(Plan.id, Plan.name))
+
+    payments = query.order_by(Payment.created_at.desc()).all()
 
     return payments, None
 
@@ -115,12 +356,55 @@ class PaymentService:
     if not valid:
       return None, err
 
+    # datetimes keep the exact created_at BETWEEN over payments; the
+    # rollup only knows whole days
+    if isinstance(start_date, datetime) or isinstance(end_date, datetime):
+      total = db.session.query(func.coalesce(
+          func.sum(Payment.amount),
+          0)).filter(Payment.gym_id == gym_id, Payment.status == "PAID",
+                     Payment.created_at.between(start_date, end_date)).scalar()
+      return total, None
+
+    # dates: both days included, at most one rollup row per day and method
+    # whatever the payment volume
     total = db.session.query(func.coalesce(
-        func.sum(Payment.amount),
-        0)).filter(Payment.gym_id == gym_id, Payment.status == "PAID",
-                   Payment.created_at.between(start_date, end_date)).scalar()
+        func.sum(RevenueDaily.total_amount),
+        0)).filter(RevenueDaily.gym_id == gym_id,
+                   RevenueDaily.status == "PAID",
+                   RevenueDaily.day.between(start_date, end_date)).scalar()
     return total, None
 
+  @staticmethod
+  def rebuild_revenue_rollup(gym_id=None):
+    if gym_id:
+      valid, err = validate_id(gym_id)
+      if not valid:
+        return None, err
+
+    day = cast(Payment.created_at, Date)
+    source = select(Payment.gym_id, day, Payment.payment_method,
+                    Payment.status, func.sum(Payment.amount),
+                    func.count(Payment.id)).group_by(Payment.gym_id, day,
+                                                     Payment.payment_method,
+                                                     Payment.status)
+    stale = RevenueDaily.query
+    if gym_id:
+      source = source.where(Payment.gym_id == gym_id)
+      stale = stale.filter(RevenueDaily.gym_id == gym_id)
+
+    try:
+      stale.delete(synchronize_session=False)
+      result = db.session.execute(
+          pg_insert(RevenueDaily).from_select([
+              "gym_id", "day", "payment_method", "status", "total_amount",
+              "payment_count"
+          ], source))
+      db.session.commit()
+      return result.rowcount, None
+    except Exception:
+      db.session.rollback()
+      return None, "Something went wrong. Please try again."
+
   @staticmethod
   def get_total_paid_for_membership(gym_id, membership_id) -> Decimal:
     total = (db.session.query(db.func.coalesce(db.func.sum(
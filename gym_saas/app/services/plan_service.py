@@ -1,8 +1,10 @@
 from gym_saas.app.extensions import db
-from gym_saas.app.models import Gym, Plan
+from gym_saas.app.models import Plan
 from gym_saas.app.utils.validation import (validate_id, validate_name,
                                   validate_duration_months, validate_price)
 from gym_saas.app.utils.generate_id import generate_id
+from gym_saas.app.utils.tenant import gym_exists, gym_is_active
+from gym_saas.app.utils.db_errors import constraint_name
 from sqlalchemy.exc import IntegrityError
 from decimal import Decimal
 from typing import Optional
@@ -19,8 +21,7 @@ class PlanService:
     if not gym_id_valid:
       return None, gym_id_error
 
-    gym = Gym.query.filter_by(id=gym_id, is_active=True).first()
-    if not gym:
+    if not gym_is_active(gym_id):
       return None, "Gym does not exist"
 
     name_valid, name_error = validate_name(name)
@@ -95,8 +96,8 @@ class PlanService:
     if not gym_id_valid:
       return None, gym_id_error
 
-    gym = Gym.query.filter_by(id=gym_id).first()
-    if not gym:
+    # listed for inactive gyms too, as before the tenant cache
+    if not gym_exists(gym_id):
       return None, "Gym does not exist"
 
     plans = Plan.query.filter(Plan.gym_id == gym_id).all()
@@ -146,12 +147,6 @@ class PlanService:
       if not name_valid:
         return None, name_error
 
-      name_exists = Plan.query.filter(Plan.name == name, Plan.gym_id == gym_id,
-                                      Plan.id != plan_id).first()
-
-      if name_exists:
-        return None, "Plan name already exists"
-
       plan.name = name
 
     if duration_months is not None:
@@ -172,13 +167,16 @@ class PlanService:
         return None, "Description cannot exceed 2000 characters"
       plan.description = description
 
+    # uq_plan_name_per_gym rejects a name taken by another plan
     try:
       db.session.commit()
       return plan, None
 
-    except IntegrityError:
+    except IntegrityError as e:
       db.session.rollback()
-      return None, "Plan name already exists"
+      if constraint_name(e) == "uq_plan_name_per_gym":
+        return None, "Plan name already exists"
+      return None, "Something went wrong. Please try again."
 
     except Exception:
       db.session.rollback()
@@ -0,0 +1,115 @@
+from collections import OrderedDict
+import threading
+import time
+
+
+# process-local, so each worker holds its own copy; keep TTLs short
+class TTLCache:
+
+  def __init__(self, ttl, maxsize=1024):
+    self.ttl = ttl
+    self.maxsize = maxsize
+    self._data = {}
+    self._lock = threading.Lock()
+
+  def get(self, key, default=None):
+    with self._lock:
+      item = self._data.get(key)
+      if item is None:
+        return default
+
+      expires_at, value = item
+      if expires_at <= time.monotonic():
+        del self._data[key]
+        return default
+
+      return value
+
+  def set(self, key, value, ttl=None):
+    with self._lock:
+      if key not in self._data and len(self._data) >= self.maxsize:
+        self._evict()
+      self._data[key] = (time.monotonic() + (ttl or self.ttl), value)
+
+  def update(self, key, fn):
+    # only touches live entries; a missing entry is rebuilt on next read
+    with self._lock:
+      item = self._data.get(key)
+      if item is None or item[0] <= time.monotonic():
+        return
+      self._data[key] = (item[0], fn(item[1]))
+
+  def delete(self, key):
+    with self._lock:
+      self._data.pop(key, None)
+
+  def clear(self):
+    with self._lock:
+      self._data.clear()
+
+  def _evict(self):
+    now = time.monotonic()
+    for key in [k for k, (exp, _) in self._data.items() if exp <= now]:
+      del self._data[key]
+
+    if len(self._data) >= self.maxsize:
+      oldest = min(self._data, key=lambda k: self._data[k][0])
+      del self._data[oldest]
+
+
+# monotonically increasing per-key counters; a cached value tagged with an
+# older version is stale
+class VersionCounter:
+
+  def __init__(self):
+    self._versions = {}
+    self._lock = threading.Lock()
+
+  def get(self, key):
+    with self._lock:
+      return self._versions.get(key, 0)
+
+  def bump(self, key):
+    with self._lock:
+      self._versions[key] = self._versions.get(key, 0) + 1
+
+
+# least-recently-used entries are dropped once the summed sizes go over the
+# byte budget; values report their own size when stored
+class SizedLRUCache:
+
+  def __init__(self, budget):
+    self.budget = budget
+    self.used = 0
+    self._data = OrderedDict()
+    self._lock = threading.Lock()
+
+  def get(self, key, default=None):
+    with self._lock:
+      item = self._data.get(key)
+      if item is None:
+        return default
+      self._data.move_to_end(key)
+      return item[1]
+
+  def set(self, key, value, size):
+    with self._lock:
+      self._pop(key)
+      if size > self.budget:
+        return False
+
+      while self._data and self.used + size > self.budget:
+        self._pop(next(iter(self._data)))
+
+      self._data[key] = (size, value)
+      self.used += size
+      return True
+
+  def delete(self, key):
+    with self._lock:
+      self._pop(key)
+
+  def _pop(self, key):
+    item = self._data.pop(key, None)
+    if item is not None:
+      self.used -= item[0]
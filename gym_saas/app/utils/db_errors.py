@@ -0,0 +1,9 @@
+from sqlalchemy.exc import IntegrityError
+
+
+def constraint_name(error):
+  # psycopg2 reports the violated constraint (or unique index) by name
+  if not isinstance(error, IntegrityError):
+    return None
+  diag = getattr(error.orig, "diag", None)
+  return getattr(diag, "constraint_name", None)
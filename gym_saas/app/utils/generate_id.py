@@ -1,4 +1,37 @@
+import os
+import threading
+import time
+import uuid
+
+_COUNTER_BITS = 74  # 12-bit rand_a + 62-bit rand_b
+_lock = threading.Lock()
+_last = (0, 0)  # (unix millis, counter) of the previous id
+
+
 def  generate_id():
-  import uuid
-  return str(uuid.uuid4())
+  # UUIDv7: 48-bit unix milliseconds up front, so new rows append to the
+  # right-hand edge of PK/FK b-trees instead of landing on random pages.
+  # Ids from the same millisecond step a random amount up from the previous
+  # one (RFC 9562 6.2, method 2), so a burst still arrives in order
+  global _last
+  millis = time.time_ns() // 1_000_000
+
+  with _lock:
+    last_millis, last_counter = _last
+    if millis > last_millis:
+      counter = int.from_bytes(os.urandom(10), "big") >> (80 - _COUNTER_BITS)
+    else:
+      # same millisecond, or the clock stepped back
+      millis = last_millis
+      counter = last_counter + 1 + int.from_bytes(os.urandom(4), "big")
+      if counter >> _COUNTER_BITS:
+        millis += 1
+        counter = int.from_bytes(os.urandom(10), "big") >> (80 - _COUNTER_BITS)
+    _last = (millis, counter)
 
+  value = ((millis & 0xFFFFFFFFFFFF) << 80
+           | 0x7 << 76  # version 7
+           | (counter >> 62) << 64
+           | 0x2 << 62  # RFC 4122 variant
+           | counter & (2**62 - 1))
+  return str(uuid.UUID(int=value))
@@ -0,0 +1,35 @@
+import base64
+import json
+from gym_saas.app.extensions import db
+
+
+def encode_cursor(*values):
+  raw = json.dumps(values, separators=(",", ":"))
+  return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor, size):
+  try:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+  except (ValueError, TypeError):
+    return None, "Invalid cursor"
+
+  if not isinstance(values, list) or len(values) != size:
+    return None, "Invalid cursor"
+
+  return values, None
+
+
+def estimate_count(query, exact_below=1000):
+  # planner estimate from EXPLAIN; small results are cheap to count exactly
+  # and are where estimates are least reliable
+  compiled = query.statement.compile(dialect=db.engine.dialect)
+  plan = db.session.connection().exec_driver_sql(
+      "EXPLAIN (FORMAT JSON) " + str(compiled), compiled.params).scalar()
+
+  estimate = int(plan[0]["Plan"]["Plan Rows"])
+  if estimate < exact_below:
+    return query.count()
+
+  return estimate
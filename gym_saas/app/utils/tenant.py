@@ -0,0 +1,61 @@
+from flask import g, has_request_context
+from flask_jwt_extended import get_jwt
+from gym_saas.app.extensions import db
+from gym_saas.app.models import Gym
+from gym_saas.app.utils.cache import TTLCache
+
+# gym_id -> (exists, is_active), shared by requests in this process
+_gym_status = TTLCache(ttl=60)
+
+
+def current_tenant():
+  # built once per request from the claims verified by @jwt_required
+  if not has_request_context():
+    return None
+
+  if "tenant" not in g:
+    try:
+      claims = get_jwt()
+    except RuntimeError:
+      claims = {}
+
+    g.tenant = {
+        "gym_id": claims.get("gym_id") or claims.get("sub"),
+        "is_active": claims.get("is_active", True)
+    } if claims else None
+
+  return g.tenant
+
+
+def _load_gym_status(gym_id):
+  status = _gym_status.get(gym_id)
+  if status is None:
+    is_active = db.session.query(
+        Gym.is_active).filter(Gym.id == gym_id).scalar()
+    status = (is_active is not None, bool(is_active))
+    _gym_status.set(gym_id, status)
+  return status
+
+
+def gym_exists(gym_id):
+  # active or not; reads that still serve a deactivated gym use this
+  return _load_gym_status(gym_id)[0]
+
+
+def gym_is_active(gym_id):
+  tenant = current_tenant()
+  if tenant is None or tenant["gym_id"] != gym_id:
+    return _load_gym_status(gym_id)[1]
+
+  # later service calls in the same request reuse the answer
+  if "gym_active" not in tenant:
+    tenant["gym_active"] = bool(
+        tenant["is_active"]) and _load_gym_status(gym_id)[1]
+  return tenant["gym_active"]
+
+
+def forget_gym(gym_id):
+  _gym_status.delete(gym_id)
+  tenant = current_tenant()
+  if tenant is not None and tenant["gym_id"] == gym_id:
+    tenant.pop("gym_active", None)
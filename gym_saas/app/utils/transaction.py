@@ -0,0 +1,62 @@
+from contextlib import contextmanager
+from sqlalchemy import event
+from gym_saas.app.extensions import db
+
+_UOW_KEY = "unit_of_work"
+_AFTER_COMMIT_KEY = "after_commit"
+
+
+class TransactionAborted(Exception):
+  pass
+
+
+def in_unit_of_work():
+  return bool(db.session.info.get(_UOW_KEY))
+
+
+def commit_or_flush():
+  # inside a unit of work the outermost block owns the commit
+  if in_unit_of_work():
+    db.session.flush()
+  else:
+    db.session.commit()
+
+
+def rollback_or_defer():
+  # leave the rollback to the outermost block, which sees the failure
+  if not in_unit_of_work():
+    db.session.rollback()
+
+
+@contextmanager
+def unit_of_work():
+  # nested blocks join the outer one instead of opening their own
+  if in_unit_of_work():
+    yield db.session
+    return
+
+  db.session.info[_UOW_KEY] = True
+  try:
+    yield db.session
+    db.session.commit()
+  except Exception:
+    db.session.rollback()
+    raise
+  finally:
+    db.session.info.pop(_UOW_KEY, None)
+
+
+def after_commit(fn):
+  # run fn once the current transaction commits; dropped on rollback
+  db.session.info.setdefault(_AFTER_COMMIT_KEY, []).append(fn)
+
+
+@event.listens_for(db.session, "after_commit")
+def _run_after_commit(session):
+  for fn in session.info.pop(_AFTER_COMMIT_KEY, []):
+    fn()
+
+
+@event.listens_for(db.session, "after_rollback")
+def _discard_after_commit(session):
+  session.info.pop(_AFTER_COMMIT_KEY, None)
@@ -32,11 +32,17 @@ def validate_name(name):
   return True, None
 
 def validate_id(value):
-  try:
-    uuid.UUID(value)
+  # ids are native UUID columns; accept UUID objects as well as strings.
+  # Strings must already be in the canonical lowercase hyphenated form
+  # Postgres returns, so they compare equal to ids loaded from the db
+  if isinstance(value, uuid.UUID):
     return True, None
-  except ValueError:
-    return False, "Invalid ID format"
+  try:
+    if str(uuid.UUID(value)) == value:
+      return True, None
+  except (ValueError, TypeError, AttributeError):
+    pass
+  return False, "Invalid ID format"
 
 def validate_role(role):
   if role not in ["owner", "staff"]:
@@ -8,6 +8,12 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "jwt-secret")
 
+    # seconds between in-process membership status sweeps, 0 disables
+    MEMBERSHIP_SWEEP_INTERVAL = int(os.getenv("MEMBERSHIP_SWEEP_INTERVAL", "0"))
+
+    # per-worker memory for in-process analytics cubes
+    ANALYTICS_CUBE_BUDGET_MB = int(os.getenv("ANALYTICS_CUBE_BUDGET_MB", "64"))
+
 
 class DevelopmentConfig(Config):
     SQLALCHEMY_DATABASE_URI = os.environ["DATABASE_URL"]
@@ -0,0 +1,63 @@
+"""hot set indexes
+
+Revision ID: 2c7d9e4b1f86
+Revises: f18b6c2e4a70
+Create Date: 2026-10-18 14:26:50.472931
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2c7d9e4b1f86'
+down_revision = 'f18b6c2e4a70'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_memberships_gym_end_date_active',
+            'memberships',
+            ['gym_id', 'end_date'],
+            unique=False,
+            postgresql_where=sa.text('is_active IS true'),
+            postgresql_concurrently=True)
+        op.create_index(
+            'ix_members_gym_name',
+            'members',
+            ['gym_id', 'name', 'id'],
+            unique=False,
+            postgresql_concurrently=True)
+        op.create_index(
+            'ix_payments_membership_covering',
+            'payments',
+            ['membership_id'],
+            unique=False,
+            postgresql_include=['gym_id', 'amount'],
+            postgresql_concurrently=True)
+        # superseded by the covering index above
+        op.drop_index('ix_payments_membership_id',
+                      table_name='payments',
+                      postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_payments_membership_id',
+            'payments',
+            ['membership_id'],
+            unique=False,
+            postgresql_concurrently=True)
+        op.drop_index('ix_payments_membership_covering',
+                      table_name='payments',
+                      postgresql_concurrently=True)
+        op.drop_index('ix_members_gym_name',
+                      table_name='members',
+                      postgresql_concurrently=True)
+        op.drop_index('ix_memberships_gym_end_date_active',
+                      table_name='memberships',
+                      postgresql_concurrently=True)
@@ -0,0 +1,37 @@
+"""membership keyset index
+
+Revision ID: 3f1c8a2d5b7e
+Revises: 9de9947b6f9b
+Create Date: 2026-10-18 09:12:41.503318
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c8a2d5b7e'
+down_revision = '9de9947b6f9b'
+branch_labels = None
+depends_on = None
+
+# must stay identical to Membership.status_rank for the planner to match it
+STATUS_RANK = sa.text(
+    "(CASE status WHEN 'expired' THEN 1 WHEN 'active' THEN 2 "
+    "WHEN 'cancelled' THEN 3 ELSE 4 END)")
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        op.create_index('ix_memberships_gym_status_rank_end_date',
+                        'memberships',
+                        ['gym_id', STATUS_RANK, 'end_date', 'id'],
+                        unique=False,
+                        postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_memberships_gym_status_rank_end_date',
+                      table_name='memberships',
+                      postgresql_concurrently=True)
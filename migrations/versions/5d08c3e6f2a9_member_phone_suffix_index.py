@@ -0,0 +1,34 @@
+"""member phone suffix index
+
+Revision ID: 5d08c3e6f2a9
+Revises: b72e4d9a1c03
+Create Date: 2026-10-18 10:41:55.917203
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d08c3e6f2a9'
+down_revision = 'b72e4d9a1c03'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_members_gym_phone_reversed',
+            'members',
+            ['gym_id', sa.text('reverse(phone_number) text_pattern_ops')],
+            unique=False,
+            postgresql_where=sa.text('phone_number IS NOT NULL'),
+            postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_members_gym_phone_reversed',
+                      table_name='members',
+                      postgresql_concurrently=True)
@@ -0,0 +1,33 @@
+"""membership cancelled_at
+
+Revision ID: 7b2e5c9d4a13
+Revises: 2c7d9e4b1f86
+Create Date: 2026-10-18 18:05:12.604318
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7b2e5c9d4a13'
+down_revision = '2c7d9e4b1f86'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('memberships',
+                  sa.Column('cancelled_at', sa.DateTime(), nullable=True))
+
+    # the real cancellation time of existing rows is unknown; the end of
+    # the term, or now if that is still ahead, is the closest bound
+    op.execute("""
+        UPDATE memberships
+        SET cancelled_at = LEAST(end_date, now() AT TIME ZONE 'utc')
+        WHERE status = 'cancelled'
+    """)
+
+
+def downgrade():
+    op.drop_column('memberships', 'cancelled_at')
@@ -0,0 +1,33 @@
+"""payment ledger index
+
+Revision ID: 8a4e2f61c9d7
+Revises: 5d08c3e6f2a9
+Create Date: 2026-10-18 11:20:34.561842
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8a4e2f61c9d7'
+down_revision = '5d08c3e6f2a9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_payments_gym_created_at_id',
+            'payments',
+            ['gym_id', sa.text('created_at DESC'), sa.text('id DESC')],
+            unique=False,
+            postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_payments_gym_created_at_id',
+                      table_name='payments',
+                      postgresql_concurrently=True)
@@ -0,0 +1,35 @@
+"""member name trigram index
+
+Revision ID: b72e4d9a1c03
+Revises: 3f1c8a2d5b7e
+Create Date: 2026-10-18 10:02:17.284615
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b72e4d9a1c03'
+down_revision = '3f1c8a2d5b7e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    with op.get_context().autocommit_block():
+        op.create_index('ix_members_name_trgm',
+                        'members', ['name'],
+                        unique=False,
+                        postgresql_using='gin',
+                        postgresql_ops={'name': 'gin_trgm_ops'},
+                        postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_members_name_trgm',
+                      table_name='members',
+                      postgresql_concurrently=True)
@@ -0,0 +1,45 @@
+"""revenue daily rollup
+
+Revision ID: c41f7b9e2d58
+Revises: 8a4e2f61c9d7
+Create Date: 2026-10-18 11:52:08.304119
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'c41f7b9e2d58'
+down_revision = '8a4e2f61c9d7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('revenue_daily',
+    sa.Column('gym_id', sa.String(length=50), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('payment_method', postgresql.ENUM(name='payment_methods', create_type=False), nullable=False),
+    sa.Column('status', postgresql.ENUM(name='payment_status', create_type=False), nullable=False),
+    sa.Column('total_amount', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('payment_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['gym_id'], ['gyms.id'], ),
+    sa.PrimaryKeyConstraint('gym_id', 'day', 'payment_method', 'status')
+    )
+
+    # existing payments, so revenue summaries don't read 0 until someone
+    # runs `flask revenue backfill`
+    op.execute("""
+        INSERT INTO revenue_daily
+            (gym_id, day, payment_method, status, total_amount, payment_count)
+        SELECT gym_id, created_at::date, payment_method, status,
+               sum(amount), count(id)
+        FROM payments
+        GROUP BY gym_id, created_at::date, payment_method, status
+    """)
+
+
+def downgrade():
+    op.drop_table('revenue_daily')
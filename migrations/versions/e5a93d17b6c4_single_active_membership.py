@@ -0,0 +1,50 @@
+"""single active membership per member
+
+Revision ID: e5a93d17b6c4
+Revises: c41f7b9e2d58
+Create Date: 2026-10-18 12:37:41.150276
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5a93d17b6c4'
+down_revision = 'c41f7b9e2d58'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # races could leave a member with several active memberships; keep the
+    # newest and cancel the rest so the unique index can be built
+    op.execute("""
+        UPDATE memberships SET is_active = false, status = 'cancelled'
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT id, row_number() OVER (
+                    PARTITION BY member_id
+                    ORDER BY created_at DESC, id DESC) AS rn
+                FROM memberships
+                WHERE is_active
+            ) ranked
+            WHERE rn > 1
+        )
+    """)
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'uq_membership_active_per_member',
+            'memberships',
+            ['member_id'],
+            unique=True,
+            postgresql_where=sa.text('is_active'),
+            postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('uq_membership_active_per_member',
+                      table_name='memberships',
+                      postgresql_concurrently=True)
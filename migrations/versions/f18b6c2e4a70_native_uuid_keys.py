@@ -0,0 +1,58 @@
+"""native uuid keys
+
+Revision ID: f18b6c2e4a70
+Revises: e5a93d17b6c4
+Create Date: 2026-10-18 13:44:12.908415
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f18b6c2e4a70'
+down_revision = 'e5a93d17b6c4'
+branch_labels = None
+depends_on = None
+
+# (table, column, referenced table) for every foreign key on an id column
+FOREIGN_KEYS = [
+    ('members', 'gym_id', 'gyms'),
+    ('plans', 'gym_id', 'gyms'),
+    ('users', 'gym_id', 'gyms'),
+    ('memberships', 'gym_id', 'gyms'),
+    ('memberships', 'member_id', 'members'),
+    ('memberships', 'plan_id', 'plans'),
+    ('payments', 'gym_id', 'gyms'),
+    ('payments', 'membership_id', 'memberships'),
+    ('revenue_daily', 'gym_id', 'gyms'),
+]
+
+PRIMARY_KEYS = ['gyms', 'members', 'plans', 'users', 'memberships', 'payments']
+
+
+def _convert(new_type, using):
+    # ALTER COLUMN ... TYPE rewrites each table under an exclusive lock;
+    # run this in a maintenance window on large databases
+    for table, column, _ in FOREIGN_KEYS:
+        op.drop_constraint(f'{table}_{column}_fkey', table, type_='foreignkey')
+
+    for table in PRIMARY_KEYS:
+        op.alter_column(table, 'id', type_=new_type,
+                        postgresql_using=using.format(column='id'))
+
+    for table, column, _ in FOREIGN_KEYS:
+        op.alter_column(table, column, type_=new_type,
+                        postgresql_using=using.format(column=column))
+
+    for table, column, referred in FOREIGN_KEYS:
+        op.create_foreign_key(f'{table}_{column}_fkey', table, referred,
+                              [column], ['id'])
+
+
+def upgrade():
+    _convert(sa.Uuid(), '{column}::uuid')
+
+
+def downgrade():
+    _convert(sa.String(length=50), '{column}::text')
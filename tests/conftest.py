@@ -0,0 +1,113 @@
+import os
+from contextlib import contextmanager
+
+import pytest
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event, text
+
+# in-memory SQLite by default; point TEST_DATABASE_URL at a scratch
+# Postgres database to also run the tests marked requires_postgres
+os.environ["DATABASE_URL"] = os.environ.get("TEST_DATABASE_URL", "sqlite://")
+os.environ["MEMBERSHIP_SWEEP_INTERVAL"] = "0"
+os.environ["JWT_SECRET_KEY"] = "test-jwt-secret-long-enough-for-hs256"
+
+from gym_saas.app import create_app
+from gym_saas.app.extensions import db as _db
+from gym_saas.app.models import Member
+
+
+def pytest_runtest_setup(item):
+    if (item.get_closest_marker("requires_postgres")
+            and not os.environ["DATABASE_URL"].startswith("postgresql")):
+        pytest.skip("requires TEST_DATABASE_URL pointing at Postgres")
+
+
+def _reverse(value):
+    return None if value is None else value[::-1]
+
+
+@pytest.fixture(scope="session")
+def app():
+    app = create_app()
+    app.config["TESTING"] = True
+
+    with app.app_context():
+        if _db.engine.dialect.name == "sqlite":
+
+            @event.listens_for(_db.engine, "connect")
+            def sqlite_functions(dbapi_connection, _):
+                # ix_members_gym_phone_reversed is built on reverse()
+                dbapi_connection.create_function("reverse",
+                                                 1,
+                                                 _reverse,
+                                                 deterministic=True)
+
+            _db.engine.dispose()
+        yield app
+
+
+def _skipped_indexes(engine):
+    if engine.dialect.name != "postgresql":
+        return []
+
+    with engine.begin() as conn:
+        available = conn.scalar(
+            text("SELECT count(*) FROM pg_available_extensions "
+                 "WHERE name = 'pg_trgm'"))
+        if available:
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            return []
+
+    # builds without contrib still run everything but the trigram index
+    return [
+        index for index in Member.__table__.indexes
+        if index.name == "ix_members_name_trgm"
+    ]
+
+
+@pytest.fixture
+def db(app):
+    skipped = _skipped_indexes(_db.engine)
+    for index in skipped:
+        Member.__table__.indexes.discard(index)
+    try:
+        _db.create_all()
+    finally:
+        Member.__table__.indexes.update(skipped)
+
+    yield _db
+    _db.session.remove()
+    _db.drop_all()
+
+
+@pytest.fixture
+def count_queries(db):
+
+    @contextmanager
+    def counter():
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context,
+                   executemany):
+            statements.append(statement)
+
+        event.listen(db.engine, "before_cursor_execute", record)
+        try:
+            yield statements
+        finally:
+            event.remove(db.engine, "before_cursor_execute", record)
+
+    return counter
+
+
+@pytest.fixture
+def login(app, db):
+
+    def client_for(gym):
+        client = app.test_client()
+        client.set_cookie("access_token",
+                          create_access_token(identity=gym.id),
+                          domain="localhost")
+        return client
+
+    return client_for
@@ -0,0 +1,75 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from gym_saas.app.extensions import db
+from gym_saas.app.models import Gym, Member, Membership, Payment, Plan
+from gym_saas.app.utils.generate_id import generate_id
+
+
+def make_gym(**fields):
+    gym_id = generate_id()
+    gym = Gym(id=gym_id,
+              name=fields.pop("name", "Iron Temple"),
+              phone_number=fields.pop("phone_number", gym_id[-10:]),
+              email=fields.pop("email", f"{gym_id}@example.com"),
+              password_hash="x",
+              **fields)
+    db.session.add(gym)
+    db.session.commit()
+    return gym
+
+
+def make_plan(gym, **fields):
+    plan = Plan(id=generate_id(),
+                gym_id=gym.id,
+                name=fields.pop("name", "Monthly"),
+                duration_months=fields.pop("duration_months", 1),
+                price=fields.pop("price", Decimal("1000.00")),
+                **fields)
+    db.session.add(plan)
+    db.session.commit()
+    return plan
+
+
+def make_member(gym, **fields):
+    member_id = generate_id()
+    member = Member(id=member_id,
+                    gym_id=gym.id,
+                    name=fields.pop("name", "Asha Rao"),
+                    phone_number=fields.pop("phone_number",
+                                            str(int(member_id[-8:], 16))[-10:]),
+                    **fields)
+    db.session.add(member)
+    db.session.commit()
+    return member
+
+
+def make_membership(member, plan, **fields):
+    start_date = fields.pop("start_date", datetime.utcnow())
+    membership = Membership(id=generate_id(),
+                            gym_id=member.gym_id,
+                            member_id=member.id,
+                            plan_id=plan.id,
+                            start_date=start_date,
+                            end_date=fields.pop(
+                                "end_date", start_date + timedelta(days=30)),
+                            **fields)
+    db.session.add(membership)
+    db.session.commit()
+    return membership
+
+
+def make_payment(membership, **fields):
+    now = datetime.utcnow()
+    payment = Payment(id=generate_id(),
+                      gym_id=membership.gym_id,
+                      membership_id=membership.id,
+                      amount=fields.pop("amount", Decimal("500.00")),
+                      payment_method=fields.pop("payment_method", "cash"),
+                      status=fields.pop("status", "PAID"),
+                      paid_at=fields.pop("paid_at", now),
+                      created_at=fields.pop("created_at", now),
+                      **fields)
+    db.session.add(payment)
+    db.session.commit()
+    return payment
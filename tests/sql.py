@@ -0,0 +1,46 @@
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
+
+
+class _Captured(Exception):
+    pass
+
+
+def postgres_sql(clause):
+    return str(
+        clause.compile(dialect=postgresql.dialect(),
+                       compile_kwargs={"literal_binds": True}))
+
+
+def index_ddl(db, name):
+    for table in db.metadata.tables.values():
+        for index in table.indexes:
+            if index.name == name:
+                return postgres_sql(CreateIndex(index))
+    raise LookupError(name)
+
+
+def service_sql(db, fn, *args, skip=0, **kwargs):
+    """Postgres SQL of the ORM statement `fn` runs after `skip` others.
+
+    The statement is captured before it reaches the database, so this works
+    for Postgres-only queries on SQLite too.
+    """
+    statements = []
+
+    def capture(state):
+        statements.append(state.statement)
+        if len(statements) > skip:
+            raise _Captured
+
+    event.listen(db.session, "do_orm_execute", capture)
+    try:
+        fn(*args, **kwargs)
+    except _Captured:
+        pass
+    finally:
+        event.remove(db.session, "do_orm_execute", capture)
+        db.session.rollback()
+
+    return postgres_sql(statements[skip])
@@ -0,0 +1,176 @@
+import re
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+
+from dateutil.relativedelta import relativedelta
+
+from gym_saas.app.models import Membership, Payment
+from gym_saas.app.services.analytics_service import AnalyticsService
+from gym_saas.app.services.member_service import MemberService
+from gym_saas.app.services.payment_service import PaymentService
+from gym_saas.app.utils.transaction import TransactionAborted, unit_of_work
+from tests.factories import make_gym, make_member, make_membership, make_plan
+from tests.sql import service_sql
+
+GYM_ID = "0190a6f4-1c2b-7d3e-8f4a-5b6c7d8e9f01"
+
+
+def _series_sql(db, group_by):
+    today = date.today().isoformat()
+    return service_sql(db,
+                       AnalyticsService.get_revenue_series,
+                       GYM_ID,
+                       today,
+                       today,
+                       group_by=group_by)
+
+
+def _group_by(sql):
+    return re.search(r"GROUP BY (.*)\), ?$", sql, re.M).group(1)
+
+
+def test_ungrouped_series_groups_by_bucket_only(db):
+    sql = _series_sql(db, None)
+
+    assert "'total' AS key" in sql
+    assert _group_by(sql) == ("date_trunc('day', CAST(revenue_daily.day AS "
+                              "TIMESTAMP WITHOUT TIME ZONE))")
+
+
+@pytest.mark.parametrize("group_by, key", [
+    ("payment_method", "revenue_daily.payment_method"),
+    ("plan", "plans.name"),
+])
+def test_grouped_series_groups_by_bucket_and_key(db, group_by, key):
+    assert _group_by(_series_sql(db, group_by)).endswith(f"), {key}")
+
+
+@pytest.mark.requires_postgres
+def test_ungrouped_series_runs_and_fills_gaps(db):
+    gym = make_gym()
+    membership = make_membership(make_member(gym), make_plan(gym))
+    for amount, method in (("300", "cash"), ("200", "upi")):
+        _, error = PaymentService.create_payment(gym.id, membership.id,
+                                                 amount, method)
+        assert error is None
+
+    today = date.today()
+    series, error = AnalyticsService.get_revenue_series(
+        gym.id, (today - timedelta(days=2)).isoformat(), today.isoformat())
+
+    assert error is None
+    assert len(series["periods"]) == 3
+    assert series["series"]["total"]["amount"] == [0, 0, Decimal("500.00")]
+    assert series["series"]["total"]["count"] == [0, 0, 2]
+
+
+def test_cohort_coverage_stops_at_cancellation(db):
+    sql = service_sql(db, AnalyticsService.get_cohort_retention, GYM_ID)
+
+    assert ("least(date_trunc('month', memberships.end_date), "
+            "date_trunc('month', memberships.cancelled_at)") in sql
+
+
+def test_deactivating_a_member_records_the_cancellation(db):
+    gym = make_gym()
+    member = make_member(gym)
+    membership = make_membership(member, make_plan(gym))
+
+    _, error = MemberService.deactivate_member(gym.id, member.id)
+
+    assert error is None
+    membership = db.session.get(Membership, membership.id)
+    assert membership.status == "cancelled"
+    assert membership.cancelled_at is not None
+    assert membership.cancelled_at < membership.end_date
+
+
+@pytest.mark.requires_postgres
+def test_cancelled_member_stops_counting_as_retained(db):
+    this_month = date.today().replace(day=1)
+    joined = datetime.combine(this_month - relativedelta(months=4),
+                              datetime.min.time())
+
+    gym = make_gym()
+    plan = make_plan(gym, duration_months=12)
+    for cancelled_at in (None, joined + relativedelta(months=1, days=10)):
+        member = make_member(gym, join_date=joined)
+        make_membership(member,
+                        plan,
+                        start_date=joined,
+                        end_date=joined + relativedelta(months=12),
+                        status="cancelled" if cancelled_at else "active",
+                        is_active=cancelled_at is None,
+                        cancelled_at=cancelled_at)
+
+    report, error = AnalyticsService.get_cohort_retention(gym.id, months=6)
+
+    assert error is None
+    assert report["cohorts"] == [{
+        "cohort": joined.strftime("%Y-%m"),
+        "size": 2,
+        # the cancelled member still counts in the month they left
+        "retention": [1.0, 0.5, 0.5, 0.5, None, None]
+    }]
+
+
+# 🔹 Dashboard invalidation follows the transaction: only a commit bumps
+# the gym's version
+
+
+def _pay(membership, amount):
+    return PaymentService.create_payment(gym_id=membership.gym_id,
+                                         membership_id=membership.id,
+                                         amount=amount,
+                                         payment_method="cash")
+
+
+def test_committed_write_bumps_the_dashboard_version(db):
+    gym = make_gym()
+    membership = make_membership(make_member(gym), make_plan(gym))
+    version = AnalyticsService.dashboard_version(gym.id)
+
+    payment, error = _pay(membership, "300")
+
+    assert error is None
+    assert AnalyticsService.dashboard_version(gym.id) == version + 1
+
+
+def test_rolled_back_write_leaves_the_dashboard_version(db):
+    gym = make_gym()
+    membership = make_membership(make_member(gym), make_plan(gym))
+    version = AnalyticsService.dashboard_version(gym.id)
+
+    with pytest.raises(TransactionAborted):
+        with unit_of_work():
+            payment, error = _pay(membership, "300")
+            assert error is None
+            raise TransactionAborted("second step failed")
+
+    assert Payment.query.filter_by(gym_id=gym.id).count() == 0
+    assert AnalyticsService.dashboard_version(gym.id) == version
+
+    # the discarded bump doesn't ride along with the next commit either
+    make_member(gym)
+    assert AnalyticsService.dashboard_version(gym.id) == version
+
+
+@pytest.mark.requires_postgres
+def test_dashboard_snapshot_refreshes_only_after_a_commit(db):
+    gym = make_gym()
+    membership = make_membership(make_member(gym), make_plan(gym))
+    _pay(membership, "300")
+    kpis, _ = AnalyticsService.get_dashboard_kpis(gym.id)
+    assert kpis["todays_collections"] == Decimal("300")
+
+    with pytest.raises(TransactionAborted):
+        with unit_of_work():
+            _pay(membership, "200")
+            raise TransactionAborted("second step failed")
+    assert AnalyticsService.get_dashboard_kpis(gym.id)[0] is kpis
+
+    _pay(membership, "200")
+    kpis, _ = AnalyticsService.get_dashboard_kpis(gym.id)
+    assert kpis["todays_collections"] == Decimal("500")
@@ -0,0 +1,37 @@
+from decimal import Decimal
+
+from gym_saas.app.models import Payment, RevenueDaily
+from gym_saas.app.services.payment_service import PaymentService
+from tests.factories import make_gym, make_member, make_membership, make_plan
+
+
+def test_bad_method_fails_only_its_own_entry(db):
+    gym = make_gym()
+    plan = make_plan(gym)
+    memberships = [make_membership(make_member(gym), plan) for _ in range(2)]
+
+    report, error = PaymentService.create_payments_bulk(gym.id, [
+        {"membership_id": memberships[0].id, "amount": "400",
+         "payment_method": "cash"},
+        {"membership_id": memberships[1].id, "amount": "250",
+         "payment_method": "card"},
+        {"membership_id": memberships[1].id, "amount": "250",
+         "payment_method": "upi"},
+    ])
+
+    assert error is None
+    assert report["created"] == 2
+    assert report["failed"] == 1
+    assert report["results"][1] == {
+        "index": 1,
+        "error": "Invalid payment method"
+    }
+    assert "payment_id" in report["results"][0]
+    assert "payment_id" in report["results"][2]
+
+    assert Payment.query.filter_by(gym_id=gym.id).count() == 2
+    rollup = {
+        row.payment_method: row.total_amount
+        for row in RevenueDaily.query.filter_by(gym_id=gym.id)
+    }
+    assert rollup == {"cash": Decimal("400"), "upi": Decimal("250")}
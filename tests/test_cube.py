@@ -0,0 +1,91 @@
+from decimal import Decimal
+
+import pytest
+
+from gym_saas.app.services.analytics_service import AnalyticsService
+from gym_saas.app.services.cube_service import (CUBE_DIMENSIONS, CubeService,
+                                                GymCube)
+from tests.factories import (make_gym, make_member, make_membership,
+                             make_payment, make_plan)
+
+
+def _total(gym_id):
+    report, error = CubeService.slice(gym_id)
+    assert error is None
+    return report["total"]["amount"]
+
+
+def test_cube_is_rebuilt_once_the_dashboard_is_invalidated(db):
+    gym = make_gym()
+    membership = make_membership(make_member(gym), make_plan(gym))
+    make_payment(membership, amount=Decimal("500.00"))
+    assert _total(gym.id) == Decimal("500.00")
+
+    # the cached cube is served until the gym's version moves
+    make_payment(membership, amount=Decimal("250.00"))
+    assert _total(gym.id) == Decimal("500.00")
+
+    version = AnalyticsService.dashboard_version(gym.id)
+    AnalyticsService.invalidate_dashboard(gym.id)
+    db.session.commit()
+
+    assert AnalyticsService.dashboard_version(gym.id) == version + 1
+    assert _total(gym.id) == Decimal("750.00")
+
+
+ROWS = [
+    # amount, plan, method, month, member status, membership status
+    (Decimal("500.00"), "Monthly", "cash", "2026-01", "active", "active"),
+    (Decimal("250.50"), "Monthly", "upi", "2026-01", "active", "active"),
+    (Decimal("1200.00"), "Yearly", "upi", "2026-01", "inactive", "cancelled"),
+    (Decimal("500.00"), "Monthly", "cash", "2026-02", "inactive", "expired"),
+    (Decimal("99.99"), "Drop-in", "cash", "2026-02", "active", "active"),
+    (Decimal("1200.00"), "Yearly", "cash", "2026-02", "active", "active"),
+    (Decimal("250.50"), "Monthly", "upi", "2026-03", "active", "expired"),
+]
+
+
+@pytest.fixture
+def cube():
+    cube = GymCube()
+    for amount, plan, method, month, member, membership in ROWS:
+        cube.append(amount,
+                    plan=plan,
+                    payment_method=method,
+                    month=month,
+                    member_status=member,
+                    membership_status=membership)
+    return cube
+
+
+def _reference(group_by, filters):
+    totals = {}
+    for amount, *labels in ROWS:
+        row = dict(zip(CUBE_DIMENSIONS, labels))
+        if all(row[dim] in wanted for dim, wanted in filters.items()):
+            key = tuple(row[dim] for dim in group_by)
+            entry = totals.setdefault(key, [Decimal("0.00"), 0])
+            entry[0] += amount
+            entry[1] += 1
+    return [{
+        **dict(zip(group_by, key)), "amount": amount,
+        "count": count
+    } for key, (amount, count) in sorted(totals.items())]
+
+
+@pytest.mark.parametrize("group_by", [
+    (),
+    ("plan",),
+    ("month", "payment_method"),
+    ("plan", "member_status", "month"),
+    CUBE_DIMENSIONS,
+])
+@pytest.mark.parametrize("filters", [
+    {},
+    {"payment_method": ["upi"]},
+    {"plan": ["Monthly", "Yearly"], "member_status": ["active"]},
+    {"month": ["2026-02", "2030-01"]},
+    {"plan": ["Pilates"]},
+])
+def test_aggregate_matches_a_row_by_row_reference(cube, group_by, filters):
+    assert cube.aggregate(group_by, filters) == _reference(group_by, filters)
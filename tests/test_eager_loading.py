@@ -0,0 +1,170 @@
+import pytest
+
+from gym_saas.app.models import Gym, Payment, Plan
+from gym_saas.app.services.membership_service import MembershipService
+from gym_saas.app.services.payment_service import PaymentService
+from tests.factories import (make_gym, make_member, make_membership,
+                             make_payment, make_plan)
+
+
+def _seed(db, gym_id, plan_ids, rows):
+    gym = db.session.get(Gym, gym_id)
+    plans = [db.session.get(Plan, plan_id) for plan_id in plan_ids]
+    for i in range(rows):
+        member = make_member(gym, name=f"Member {i}")
+        membership = make_membership(member, plans[i % len(plans)])
+        make_payment(membership)
+    # start from an empty identity map so any lazy load would hit the db
+    db.session.expunge_all()
+
+
+def _statement_counts(db, count_queries, load, render):
+    gym = make_gym()
+    plan_ids = [make_plan(gym, name=f"Plan {i}").id for i in range(3)]
+    gym_id = gym.id
+
+    counts = []
+    for rows in (3, 15):
+        _seed(db, gym_id, plan_ids, rows)
+        with count_queries() as statements:
+            render(load(gym_id, plan_ids[0]))
+        counts.append(len(statements))
+    return counts
+
+
+def test_membership_page_query_count_is_constant(db, count_queries):
+
+    def load(gym_id, plan_id):
+        memberships, _, error = MembershipService.list_memberships_page(
+            gym_id, per_page=100)
+        assert error is None
+        return memberships
+
+    def render(memberships):
+        return [(m.member.name, m.plan.name, m.plan.price)
+                for m in memberships]
+
+    small, large = _statement_counts(db, count_queries, load, render)
+    assert small == large
+
+
+def test_active_memberships_query_count_is_constant(db, count_queries):
+
+    def load(gym_id, plan_id):
+        memberships, error = MembershipService.list_active_memberships(
+            gym_id, eager=True)
+        assert error is None
+        return memberships
+
+    def render(memberships):
+        return [(m.member.name, m.member.phone_number, m.plan.name)
+                for m in memberships]
+
+    small, large = _statement_counts(db, count_queries, load, render)
+    assert small == large
+
+
+def test_plan_payments_query_count_is_constant(db, count_queries):
+
+    def load(gym_id, plan_id):
+        payments, error = PaymentService.list_payments_by_plan(gym_id,
+                                                               plan_id,
+                                                               eager=True)
+        assert error is None
+        return payments
+
+    def render(payments):
+        return [(p.amount, p.membership.plan.name) for p in payments]
+
+    small, large = _statement_counts(db, count_queries, load, render)
+    assert small == large == 1
+
+
+def _page_statement_counts(db, count_queries, login, url_for_rows):
+    gym = make_gym()
+    plan_ids = [make_plan(gym, name=f"Plan {i}").id for i in range(3)]
+    gym_id = gym.id
+    client = login(gym)
+
+    counts = []
+    for rows in (3, 15):
+        url = url_for_rows(db.session.get(Gym, gym_id), plan_ids, rows)
+        db.session.expunge_all()
+        # the first request warms the tenant and plan caches
+        assert client.get(url, base_url="https://localhost").status_code == 200
+        with count_queries() as statements:
+            response = client.get(url, base_url="https://localhost")
+        assert response.status_code == 200
+        counts.append(len(statements))
+    return counts
+
+
+@pytest.mark.requires_postgres
+def test_member_details_page_query_count_is_constant(db, count_queries,
+                                                     login):
+
+    def member_with_history(gym, plan_ids, rows):
+        member = make_member(gym)
+        for i in range(rows):
+            plan = db.session.get(Plan, plan_ids[i % len(plan_ids)])
+            # one active membership, the rest finished
+            membership = make_membership(member,
+                                         plan,
+                                         is_active=i == rows - 1,
+                                         status="active" if i == rows -
+                                         1 else "cancelled")
+            make_payment(membership)
+        return f"/member/{member.id}/details"
+
+    small, large = _page_statement_counts(db, count_queries, login,
+                                          member_with_history)
+    assert small == large
+
+
+def test_payment_details_page_query_count_is_constant(db, count_queries,
+                                                      login):
+
+    def busy_gym_payment(gym, plan_ids, rows):
+        gym_id = gym.id
+        _seed(db, gym_id, plan_ids, rows)
+        payment = Payment.query.filter_by(gym_id=gym_id).order_by(
+            Payment.created_at.desc()).first()
+        return f"/payment/{payment.id}/details"
+
+    small, large = _page_statement_counts(db, count_queries, login,
+                                          busy_gym_payment)
+    assert small == large
+
+
+def test_member_memberships_render_without_lazy_loads(db, count_queries):
+    gym = make_gym()
+    member = make_member(gym)
+    make_membership(member, make_plan(gym))
+    gym_id, member_id = gym.id, member.id
+    db.session.expunge_all()
+
+    memberships, error = MembershipService.list_active_memberships_for_member(
+        gym_id, member_id, eager=True)
+    assert error is None
+    with count_queries() as statements:
+        rendered = [(m.member.name, m.plan.name, m.plan.price)
+                    for m in memberships]
+
+    assert len(rendered) == 1
+    assert statements == []
+
+
+def test_payment_membership_renders_without_lazy_loads(db, count_queries):
+    gym = make_gym()
+    membership = make_membership(make_member(gym), make_plan(gym))
+    gym_id, membership_id = gym.id, membership.id
+    db.session.expunge_all()
+
+    with count_queries() as statements:
+        membership, error = MembershipService.get_membership(gym_id,
+                                                             membership_id,
+                                                             eager=True)
+        assert error is None
+        membership.member.name, membership.plan.name, membership.end_date
+
+    assert len(statements) == 1
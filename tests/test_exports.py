@@ -0,0 +1,80 @@
+import csv
+import io
+import json
+
+import pytest
+
+from gym_saas.app.services import export_service
+from gym_saas.app.services.export_service import EXPORTS
+from tests.factories import (make_gym, make_member, make_membership,
+                             make_payment, make_plan)
+
+
+def _seed(gym, rows):
+    plan = make_plan(gym)
+    ids = {"members": [], "memberships": [], "payments": []}
+    for _ in range(rows):
+        member = make_member(gym)
+        membership = make_membership(member, plan)
+        payment = make_payment(membership)
+        ids["members"].append(str(member.id))
+        ids["memberships"].append(str(membership.id))
+        ids["payments"].append(str(payment.id))
+    return ids
+
+
+@pytest.fixture
+def client_and_ids(db, login, monkeypatch):
+    # several batches per export
+    monkeypatch.setattr(export_service, "EXPORT_BATCH_SIZE", 2)
+    gym = make_gym()
+    ids = _seed(gym, 5)
+    _seed(make_gym(), 2)
+    return login(gym), ids
+
+
+def _get(client, path):
+    response = client.get(path, base_url="https://localhost")
+    assert response.status_code == 200
+    return response
+
+
+@pytest.mark.parametrize("entity", sorted(EXPORTS))
+def test_csv_export_has_a_header_and_only_this_gyms_rows(client_and_ids,
+                                                         entity):
+    client, ids = client_and_ids
+
+    response = _get(client, f"/export/{entity}.csv")
+
+    assert response.mimetype == "text/csv"
+    reader = csv.reader(io.StringIO(response.get_data(as_text=True)))
+    header, *rows = list(reader)
+    assert header == EXPORTS[entity][1]
+    assert [row[0] for row in rows] == ids[entity]
+
+
+@pytest.mark.parametrize("entity", sorted(EXPORTS))
+def test_jsonl_export_has_one_object_per_row_for_this_gym(client_and_ids,
+                                                          entity):
+    client, ids = client_and_ids
+
+    response = _get(client, f"/export/{entity}.jsonl")
+
+    assert response.mimetype == "application/x-ndjson"
+    lines = response.get_data(as_text=True).splitlines()
+    records = [json.loads(line) for line in lines]
+    assert all(list(r) == EXPORTS[entity][1] for r in records)
+    assert [r["id"] for r in records] == ids[entity]
+
+
+@pytest.mark.parametrize("path, error", [
+    ("/export/invoices.csv", "Unknown export"),
+    ("/export/members.xlsx", "Unsupported export format"),
+])
+def test_unknown_exports_are_rejected(client_and_ids, path, error):
+    client, _ = client_and_ids
+
+    response = client.get(path, base_url="https://localhost")
+
+    assert response.status_code == 400
+    assert response.get_json() == {"error": error}
@@ -0,0 +1,18 @@
+import uuid
+
+from gym_saas.app.utils.generate_id import generate_id
+from gym_saas.app.utils.validation import validate_id
+
+
+def test_ids_are_canonical_uuid7():
+    value = generate_id()
+
+    assert validate_id(value) == (True, None)
+    assert uuid.UUID(value).version == 7
+
+
+def test_a_burst_of_ids_sorts_in_creation_order():
+    ids = [generate_id() for _ in range(20000)]
+
+    assert ids == sorted(ids)
+    assert len(set(ids)) == len(ids)
@@ -0,0 +1,196 @@
+import re
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from gym_saas.app.models import Member, Membership, Payment
+from gym_saas.app.services.member_service import MemberService
+from gym_saas.app.services.membership_service import MembershipService
+from gym_saas.app.services.payment_service import PaymentService
+from gym_saas.app.utils.generate_id import generate_id
+from tests.factories import make_gym, make_plan
+from tests.sql import index_ddl, postgres_sql, service_sql
+
+GYM_ID = "0190a6f4-1c2b-7d3e-8f4a-5b6c7d8e9f01"
+MEMBERSHIP_ID = "0190a6f4-1c2b-7d3e-8f4a-5b6c7d8e9f02"
+
+
+# 🔹 Query predicates must match the index expressions, or the planner
+# cannot use the index at all
+
+
+def test_membership_page_orders_by_the_indexed_status_rank(db):
+    sql = service_sql(db, MembershipService.list_memberships_page, GYM_ID)
+    rank = postgres_sql(Membership.status_rank)
+
+    assert f"ORDER BY {rank}, memberships.end_date, memberships.id" in sql
+    assert (f"(gym_id, ({rank.replace('memberships.', '')}), end_date, id)"
+            in index_ddl(db, "ix_memberships_gym_status_rank_end_date"))
+
+
+def test_phone_suffix_search_matches_the_reversed_phone_index(db):
+    sql = service_sql(db, MemberService.search_members_by_phone_suffix,
+                       GYM_ID, "1234")
+    ddl = index_ddl(db, "ix_members_gym_phone_reversed")
+
+    assert "reverse(members.phone_number) LIKE '4321%" in sql
+    assert "members.phone_number IS NOT NULL" in sql
+    assert "(gym_id, reverse(phone_number) text_pattern_ops)" in ddl
+    assert ddl.endswith("WHERE phone_number IS NOT NULL")
+
+
+@pytest.mark.parametrize("skip", [0, 1])
+def test_sweep_updates_match_the_active_partial_index(db, skip):
+    sql = service_sql(db,
+                       MembershipService.sweep_membership_statuses,
+                       GYM_ID,
+                       skip=skip)
+    ddl = index_ddl(db, "ix_memberships_gym_end_date_active")
+
+    assert sql.startswith("UPDATE memberships")
+    assert "memberships.is_active IS true" in sql
+    assert "memberships.end_date" in sql
+    assert ddl.endswith("(gym_id, end_date) WHERE is_active IS true")
+
+
+def test_ledger_order_matches_the_payment_index(db):
+    sql = service_sql(db, PaymentService.list_payments_page, GYM_ID)
+
+    assert "ORDER BY payments.created_at DESC, payments.id DESC" in sql
+    assert ("(gym_id, created_at DESC, id DESC)"
+            in index_ddl(db, "ix_payments_gym_created_at_id"))
+
+
+def test_paid_total_reads_only_covered_columns(db):
+    sql = service_sql(db, PaymentService.get_total_paid_for_membership,
+                       GYM_ID, MEMBERSHIP_ID)
+
+    assert set(re.findall(r"payments\.(\w+)", sql)) == {
+        "amount", "gym_id", "membership_id"
+    }
+    assert ("(membership_id) INCLUDE (gym_id, amount)"
+            in index_ddl(db, "ix_payments_membership_covering"))
+
+
+def test_directory_page_orders_by_the_name_index(db):
+    # the member count comes first
+    sql = service_sql(db, MemberService.list_members, GYM_ID, skip=1)
+
+    assert "ORDER BY members.name, members.id" in sql
+    assert "(gym_id, name, id)" in index_ddl(db, "ix_members_gym_name")
+
+
+# 🔹 Postgres plans: with seq scans disabled, each hot query must still be
+# served by its own index
+
+
+@pytest.fixture
+def seeded_gym(db):
+    now = datetime.utcnow()
+    gyms = [make_gym() for _ in range(2)]
+    for gym in gyms:
+        plan = make_plan(gym)
+        for i in range(150):
+            member = Member(id=generate_id(),
+                            gym_id=gym.id,
+                            name=f"Member {i:03d}",
+                            phone_number=f"98{i:08d}")
+            # a third each of active, expired and cancelled
+            status = ("active", "expired", "cancelled")[i % 3]
+            membership = Membership(id=generate_id(),
+                                    gym_id=gym.id,
+                                    member_id=member.id,
+                                    plan_id=plan.id,
+                                    end_date=now + timedelta(days=i - 75),
+                                    status=status,
+                                    is_active=status != "cancelled")
+            payment = Payment(id=generate_id(),
+                              gym_id=gym.id,
+                              membership_id=membership.id,
+                              amount=500,
+                              payment_method="cash",
+                              status="PAID")
+            db.session.add_all([member, membership, payment])
+    db.session.commit()
+    db.session.execute(db.text("ANALYZE"))
+    db.session.commit()
+    return gyms[0]
+
+
+def _plans(db, fn, *args, **kwargs):
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(db.engine, "before_cursor_execute", capture)
+    try:
+        fn(*args, **kwargs)
+    finally:
+        event.remove(db.engine, "before_cursor_execute", capture)
+        db.session.rollback()
+
+    plans = []
+    with db.engine.connect() as conn:
+        conn.exec_driver_sql("SET enable_seqscan = off")
+        for statement, parameters in statements:
+            plans.append("\n".join(
+                row[0] for row in conn.exec_driver_sql(
+                    f"EXPLAIN {statement}", parameters)))
+    return plans
+
+
+def _uses(plans, index):
+    return any(f" {index} " in plan or plan.endswith(f" {index}")
+               for plan in plans)
+
+
+@pytest.mark.requires_postgres
+def test_sweep_plan_uses_the_active_partial_index(db, seeded_gym):
+    plans = _plans(db, MembershipService.sweep_membership_statuses,
+                   seeded_gym.id)
+
+    updates = [p for p in plans if p.startswith("Update on memberships")]
+    assert len(updates) == 2
+    assert all(_uses([p], "ix_memberships_gym_end_date_active")
+               for p in updates)
+
+
+@pytest.mark.requires_postgres
+def test_membership_page_plan_uses_the_status_rank_index(db, seeded_gym):
+    plans = _plans(db, MembershipService.list_memberships_page,
+                   seeded_gym.id)
+
+    assert _uses(plans, "ix_memberships_gym_status_rank_end_date")
+
+
+@pytest.mark.requires_postgres
+def test_phone_suffix_plan_uses_the_reversed_phone_index(db, seeded_gym):
+    plans = _plans(db, MemberService.search_members_by_phone_suffix,
+                   seeded_gym.id, "12")
+
+    assert _uses(plans, "ix_members_gym_phone_reversed")
+
+
+@pytest.mark.requires_postgres
+def test_ledger_plan_uses_the_payment_index(db, seeded_gym):
+    plans = _plans(db, PaymentService.list_payments_page, seeded_gym.id)
+
+    assert _uses(plans, "ix_payments_gym_created_at_id")
+
+
+@pytest.mark.requires_postgres
+def test_paid_total_plan_is_index_only(db, seeded_gym):
+    membership = Membership.query.filter_by(gym_id=seeded_gym.id).first()
+    plans = _plans(db, PaymentService.get_total_paid_for_membership,
+                   seeded_gym.id, membership.id)
+
+    assert "Index Only Scan using ix_payments_membership_covering" in plans[0]
+
+
+@pytest.mark.requires_postgres
+def test_directory_plan_uses_the_name_index(db, seeded_gym):
+    plans = _plans(db, MemberService.list_members, seeded_gym.id)
+
+    assert _uses(plans, "ix_members_gym_name")
@@ -0,0 +1,84 @@
+import csv
+import io
+
+import pytest
+
+from gym_saas.app.models import Member
+from gym_saas.app.services.member_service import MemberService
+from gym_saas.app.utils.pagination import estimate_count
+from tests.factories import make_gym, make_member
+
+
+@pytest.fixture
+def gym(db):
+    gym = make_gym()
+    for i in range(3):
+        make_member(gym, name=f"Member {'ABC'[i]}")
+    return gym
+
+
+def _cached_counts(gym_id, count_queries):
+    with count_queries() as statements:
+        counts = MemberService.count_members(gym_id)
+    # served from the cache, never recounted
+    assert statements == []
+    return counts
+
+
+def test_counts_are_cached_until_a_write_bumps_them(gym, count_queries):
+    assert MemberService.count_members(gym.id) == {"total": 3, "active": 3}
+
+    # written around the service, so the cache cannot know
+    make_member(gym)
+    assert _cached_counts(gym.id, count_queries) == {"total": 3, "active": 3}
+
+
+def test_create_bumps_the_cached_counts(gym, count_queries):
+    MemberService.count_members(gym.id)
+
+    member, error = MemberService.create_member(gym.id, "Dev Shah")
+
+    assert error is None
+    assert _cached_counts(gym.id, count_queries) == {"total": 4, "active": 4}
+
+
+def test_deactivate_bumps_the_cached_counts(gym, count_queries):
+    MemberService.count_members(gym.id)
+    member = Member.query.filter_by(gym_id=gym.id).first()
+
+    member, error = MemberService.deactivate_member(gym.id, member.id)
+
+    assert error is None
+    assert _cached_counts(gym.id, count_queries) == {"total": 3, "active": 2}
+
+
+def test_import_bumps_the_cached_counts(gym, count_queries):
+    MemberService.count_members(gym.id)
+    reader = csv.DictReader(
+        io.StringIO("name,phone_number\nDev Shah,9000000001\n"
+                    "Esha Rao,9000000002\n"))
+
+    report, error = MemberService.import_members(gym.id, reader)
+
+    assert error is None
+    assert report["created"] == 2
+    assert _cached_counts(gym.id, count_queries) == {"total": 5, "active": 5}
+
+
+@pytest.mark.requires_postgres
+def test_estimate_counts_exactly_below_the_threshold(db, count_queries):
+    gym = make_gym()
+    for _ in range(40):
+        make_member(gym)
+    db.session.execute(db.text("ANALYZE members"))
+    query = Member.query.filter(Member.gym_id == gym.id)
+
+    with count_queries() as statements:
+        assert estimate_count(query, exact_below=1000) == 40
+    assert [s.split()[0] for s in statements] == ["EXPLAIN", "SELECT"]
+
+    with count_queries() as statements:
+        estimate = estimate_count(query, exact_below=10)
+    # the planner's row estimate, without a count(*)
+    assert [s.split()[0] for s in statements] == ["EXPLAIN"]
+    assert 10 <= estimate <= 400
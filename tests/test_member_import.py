@@ -0,0 +1,116 @@
+import csv
+import io
+
+import pytest
+
+from gym_saas.app.models import Member
+from gym_saas.app.services import member_service
+from gym_saas.app.services.member_service import MemberService
+from tests.factories import make_gym, make_member
+
+
+def _import(gym, text, **kwargs):
+    return MemberService.import_members(gym.id,
+                                        csv.DictReader(io.StringIO(text)),
+                                        **kwargs)
+
+
+def _phones(gym):
+    return sorted(phone for phone, in Member.query.filter_by(
+        gym_id=gym.id).with_entities(Member.phone_number))
+
+
+def test_header_is_matched_loosely(db):
+    gym = make_gym()
+
+    report, error = _import(
+        gym, " Name ,PHONE,notes\nAsha Rao,9876501234,front row\n")
+
+    assert error is None
+    assert report == {"created": 1, "errors": [], "failed": 0}
+    assert _phones(gym) == ["9876501234"]
+
+
+def test_file_without_a_name_column_is_rejected(db):
+    gym = make_gym()
+
+    assert _import(gym, "full_name,phone_number\nAsha Rao,9876501234\n") == (
+        None, "CSV header must include a name column")
+    assert _phones(gym) == []
+
+
+def test_upload_without_a_name_column_is_a_bad_request(db, login):
+    gym = make_gym()
+
+    response = login(gym).post(
+        "/member/import",
+        data={"file": (io.BytesIO(b"phone_number\n9876501234\n"), "m.csv")},
+        base_url="https://localhost")
+
+    assert response.status_code == 400
+    assert response.get_json() == {
+        "error": "CSV header must include a name column"
+    }
+
+
+def test_errors_report_physical_lines_past_quoted_newlines(db):
+    gym = make_gym()
+    text = ("name,phone_number,notes\n"
+            'Asha Rao,9876501234,"prefers\nmornings"\n'
+            "B,9123401234,\n"
+            "Chitra Iyer,12345,\n")
+
+    report, error = _import(gym, text)
+
+    assert error is None
+    assert report["created"] == 1
+    assert report["errors"] == [
+        {"line": 4, "error": "Name must be at least 2 characters long"},
+        {"line": 5, "error": "Invalid phone number format"},
+    ]
+
+
+def test_duplicate_phones_are_reported_per_line(db):
+    gym = make_gym()
+    make_member(gym, phone_number="9000000001")
+    text = ("name,phone_number\n"
+            "Asha Rao,9000000001\n"
+            "Bilal Khan,9000000002\n"
+            "Chitra Iyer,9000000002\n")
+
+    report, error = _import(gym, text)
+
+    assert error is None
+    assert report["created"] == 1
+    assert report["errors"] == [
+        {"line": 2, "error": "Member with this phone number already exists"},
+        {"line": 4, "error": "Duplicate phone number in file"},
+    ]
+
+
+def test_duplicates_across_batch_boundaries_are_caught(db):
+    gym = make_gym()
+    text = "name,phone_number\n" + "".join(
+        f"Member {'ABCDEF'[i]},90000000{i % 4:02d}\n" for i in range(6))
+
+    report, error = _import(gym, text, batch_size=2)
+
+    assert error is None
+    assert report["created"] == 4
+    assert report["failed"] == 2
+    # lines 6 and 7 repeat lines 2 and 3, which an earlier batch committed
+    assert [e["line"] for e in report["errors"]] == [6, 7]
+    assert _phones(gym) == [f"90000000{i:02d}" for i in range(4)]
+
+
+def test_database_errors_are_not_sent_to_the_client(db, monkeypatch):
+    gym = make_gym()
+
+    def failing_batch(gym_id, batch, report):
+        raise RuntimeError("connection to server at 10.0.0.5 was lost")
+
+    monkeypatch.setattr(member_service, "_import_batch", failing_batch)
+    report, error = _import(gym, "name\nAsha Rao\n")
+
+    assert report is None
+    assert error == "Import stopped after 0 members. Please try again."
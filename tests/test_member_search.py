@@ -0,0 +1,50 @@
+import pytest
+
+from tests.factories import make_gym, make_member
+
+HTTPS = "https://localhost"
+
+
+def _search(client, query):
+    response = client.get("/member/search", query_string={"q": query},
+                          base_url=HTTPS)
+    return response.status_code, response.get_json()
+
+
+def _names(data):
+    return [m["name"] for m in data["members"]]
+
+
+@pytest.fixture
+def front_desk(db, login):
+    gym = make_gym()
+    make_member(gym, name="Asha Rao", phone_number="9876501234")
+    make_member(gym, name="Bilal Khan", phone_number="9123401234")
+    make_member(gym, name="Chitra Iyer", phone_number="8000012345")
+    other = make_gym()
+    make_member(other, name="Dev Shah", phone_number="9999901234")
+    return login(gym)
+
+
+@pytest.mark.requires_postgres
+def test_digits_match_the_end_of_the_number(front_desk):
+    status, data = _search(front_desk, "01234")
+
+    assert status == 200
+    assert _names(data) == ["Asha Rao", "Bilal Khan"]
+
+
+@pytest.mark.requires_postgres
+def test_digits_still_match_the_start_of_the_number(front_desk):
+    status, data = _search(front_desk, "98765")
+
+    assert status == 200
+    assert _names(data) == ["Asha Rao"]
+
+
+@pytest.mark.requires_postgres
+def test_number_with_country_code_matches_its_last_ten_digits(front_desk):
+    status, data = _search(front_desk, "919876501234")
+
+    assert status == 200
+    assert _names(data) == ["Asha Rao"]
@@ -0,0 +1,33 @@
+from datetime import datetime, timedelta
+
+from gym_saas.app.models.membership import STATUS_RANK
+from gym_saas.app.services.membership_service import MembershipService
+from tests.factories import make_gym, make_member, make_membership, make_plan
+
+
+def test_membership_pages_walk_tied_end_dates_once_each(db):
+    gym = make_gym()
+    plan = make_plan(gym)
+
+    rows = []
+    for i in range(15):
+        status = ("active", "expired", "cancelled")[i % 3]
+        # pairs of memberships end on the same day
+        end_date = datetime(2026, 4, 1) + timedelta(days=i // 2)
+        membership = make_membership(make_member(gym),
+                                     plan,
+                                     status=status,
+                                     is_active=status != "cancelled",
+                                     end_date=end_date)
+        rows.append((STATUS_RANK[status], end_date, str(membership.id)))
+
+    seen, cursor = [], None
+    while True:
+        memberships, cursor, error = MembershipService.list_memberships_page(
+            gym.id, cursor=cursor, per_page=4)
+        assert error is None
+        seen += [str(m.id) for m in memberships]
+        if cursor is None:
+            break
+
+    assert seen == [membership_id for _, _, membership_id in sorted(rows)]
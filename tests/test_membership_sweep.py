@@ -0,0 +1,90 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import func, select
+
+from gym_saas.app.models import Membership
+from gym_saas.app.services.membership_service import (SWEEP_LOCK_KEY,
+                                                      MembershipService)
+from tests.factories import make_gym, make_member, make_membership, make_plan
+
+NOW = datetime(2026, 3, 15, 6, 0)
+
+
+def _membership(gym, plan, days_left, **fields):
+    return make_membership(make_member(gym),
+                           plan,
+                           start_date=NOW - timedelta(days=60),
+                           end_date=NOW + timedelta(days=days_left),
+                           **fields)
+
+
+@pytest.fixture
+def overdue(db):
+    gym = make_gym()
+    plan = make_plan(gym)
+    memberships = {
+        "current": _membership(gym, plan, 10),
+        "in_grace": _membership(gym, plan, -1),
+        "grace_over": _membership(gym, plan, -5, status="expired"),
+        # past the grace period but never swept: both steps in one run
+        "long_overdue": _membership(gym, plan, -20),
+    }
+    return gym, {name: m.id for name, m in memberships.items()}
+
+
+def _states(db, ids):
+    db.session.expire_all()
+    return {
+        name: (m.status, m.is_active, m.cancelled_at)
+        for name, m in ((name, db.session.get(Membership, membership_id))
+                        for name, membership_id in ids.items())
+    }
+
+
+def test_sweep_moves_memberships_through_their_statuses(db, overdue):
+    gym, ids = overdue
+
+    result, error = MembershipService.sweep_membership_statuses(gym.id, NOW)
+
+    assert error is None
+    assert result == {"expired": 2, "cancelled": 2}
+    assert _states(db, ids) == {
+        "current": ("active", True, None),
+        "in_grace": ("expired", True, None),
+        "grace_over": ("cancelled", False, NOW),
+        "long_overdue": ("cancelled", False, NOW),
+    }
+
+
+def test_list_reads_leave_overdue_statuses_to_the_sweep(db, overdue,
+                                                        count_queries):
+    gym, ids = overdue
+    before = _states(db, ids)
+
+    with count_queries() as statements:
+        MembershipService.list_memberships_page(gym.id)
+        MembershipService.list_active_memberships(gym.id)
+
+    assert statements
+    assert all(s.lstrip().upper().startswith("SELECT") for s in statements)
+    assert _states(db, ids) == before
+
+
+@pytest.mark.requires_postgres
+def test_single_gym_sweep_waits_for_a_running_sweep(db, overdue):
+    gym, ids = overdue
+
+    with db.engine.connect() as other:
+        assert other.scalar(select(func.pg_try_advisory_lock(SWEEP_LOCK_KEY)))
+        try:
+            assert MembershipService.sweep_gym(gym.id, NOW) == (
+                None, "A membership sweep is already running")
+            assert MembershipService.sweep_all_gyms(NOW) == (
+                None, "A membership sweep is already running")
+        finally:
+            other.scalar(select(func.pg_advisory_unlock(SWEEP_LOCK_KEY)))
+
+    result, error = MembershipService.sweep_gym(gym.id, NOW)
+    assert error is None
+    assert result == {"expired": 2, "cancelled": 2}
@@ -0,0 +1,118 @@
+from datetime import datetime, timedelta
+
+import pytest
+from flask_jwt_extended import create_access_token
+
+from gym_saas.app.services.payment_service import (PAYMENT_METHODS,
+                                                   PaymentService)
+from tests.factories import (make_gym, make_member, make_membership,
+                             make_payment, make_plan)
+
+
+def test_payment_methods_match_the_database_enum():
+    assert PAYMENT_METHODS == ("cash", "upi")
+
+
+def test_unknown_method_filter_is_rejected(db):
+    gym = make_gym()
+
+    payments, cursor, error = PaymentService.list_payments_page(
+        gym.id, payment_method="card")
+
+    assert payments is None
+    assert error == "Invalid payment method"
+
+
+def test_ledger_filter_only_offers_enum_methods(app, db):
+    gym = make_gym()
+    membership = make_membership(make_member(gym), make_plan(gym))
+    make_payment(membership, payment_method="upi")
+
+    client = app.test_client()
+    client.set_cookie("access_token",
+                      create_access_token(identity=gym.id),
+                      domain="localhost")
+    response = client.get("/payment/list?payment_method=upi",
+                          base_url="https://localhost")
+
+    assert response.status_code == 200
+    page = response.get_data(as_text=True)
+    assert 'value="upi" selected' in page
+    assert 'value="card"' not in page
+
+
+@pytest.fixture
+def ledger(db):
+    gym = make_gym()
+    plan = make_plan(gym)
+    memberships = [make_membership(make_member(gym), plan) for _ in range(3)]
+
+    payments = []
+    # three payments share each timestamp, so pages split inside the ties
+    for i in range(24):
+        created_at = datetime(2026, 3, 1, 9) + timedelta(days=i // 3)
+        payments.append(
+            make_payment(memberships[i % 3],
+                         payment_method=("cash", "upi")[i % 2],
+                         created_at=created_at))
+
+    other = make_gym()
+    make_payment(make_membership(make_member(other), make_plan(other)),
+                 created_at=datetime(2026, 3, 4, 9))
+
+    return gym.id, [(p.id, p.created_at, p.payment_method) for p in payments]
+
+
+def _walk(gym_id, per_page, **filters):
+    seen, cursor, pages = [], None, 0
+    while True:
+        payments, cursor, error = PaymentService.list_payments_page(
+            gym_id, cursor=cursor, per_page=per_page, **filters)
+        assert error is None
+        assert len(payments) <= per_page
+        seen += [str(p.id) for p in payments]
+        pages += 1
+        if cursor is None:
+            return seen, pages
+
+
+def _newest_first(rows):
+    return [
+        str(payment_id) for payment_id, _, _ in sorted(
+            rows, key=lambda r: (r[1], str(r[0])), reverse=True)
+    ]
+
+
+def test_ledger_pages_through_tied_timestamps_once_each(ledger):
+    gym_id, rows = ledger
+
+    seen, pages = _walk(gym_id, per_page=5)
+
+    assert pages == 5
+    assert seen == _newest_first(rows)
+
+
+def test_ledger_pages_with_date_and_method_filters(ledger):
+    gym_id, rows = ledger
+
+    seen, pages = _walk(gym_id,
+                        per_page=2,
+                        date_from="2026-03-02",
+                        date_to="2026-03-05",
+                        payment_method="upi")
+
+    expected = _newest_first([
+        r for r in rows
+        if datetime(2026, 3, 2) <= r[1] < datetime(2026, 3, 6)
+        and r[2] == "upi"
+    ])
+    assert len(expected) == 6
+    assert pages == 3
+    assert seen == expected
+
+
+def test_tampered_cursor_is_rejected(ledger):
+    gym_id, _ = ledger
+
+    assert PaymentService.list_payments_page(
+        gym_id, cursor="bm90LWEtY3Vyc29y") == (None, None, "Invalid cursor")
@@ -0,0 +1,25 @@
+from gym_saas.app.services.plan_service import PlanService
+from gym_saas.app.utils.generate_id import generate_id
+from tests.factories import make_gym, make_plan
+
+
+def test_plans_are_listed_for_an_inactive_gym(db):
+    gym = make_gym(is_active=False)
+    plan = make_plan(gym)
+
+    plans, error = PlanService.list_plans(gym.id)
+
+    assert error is None
+    assert [p.id for p in plans] == [plan.id]
+
+
+def test_plans_of_an_unknown_gym_are_an_error(db):
+    assert PlanService.list_plans(generate_id()) == (None,
+                                                     "Gym does not exist")
+
+
+def test_inactive_gym_cannot_add_plans(db):
+    gym = make_gym(is_active=False)
+
+    assert PlanService.create_plan(gym.id, "Monthly", 1, "1000") == (
+        None, "Gym does not exist")
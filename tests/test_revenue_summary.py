@@ -0,0 +1,45 @@
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+
+from gym_saas.app.services.payment_service import PaymentService
+from tests.factories import (make_gym, make_member, make_membership,
+                             make_payment, make_plan)
+
+
+@pytest.fixture
+def gym(db):
+    gym = make_gym()
+    membership = make_membership(make_member(gym), make_plan(gym))
+    for created_at, amount, status in [
+        (datetime(2026, 3, 1, 9), "100", "PAID"),
+        (datetime(2026, 3, 1, 18), "200", "PAID"),
+        (datetime(2026, 3, 2, 9), "400", "PAID"),
+        (datetime(2026, 3, 2, 10), "800", "FAILED"),
+        (datetime(2026, 3, 3, 9), "1600", "PAID"),
+    ]:
+        make_payment(membership,
+                     amount=Decimal(amount),
+                     status=status,
+                     created_at=created_at)
+
+    other = make_gym()
+    make_payment(make_membership(make_member(other), make_plan(other)),
+                 created_at=datetime(2026, 3, 2, 9))
+
+    PaymentService.rebuild_revenue_rollup()
+    return gym
+
+
+# the rollup rebuild buckets with CAST(created_at AS DATE)
+@pytest.mark.requires_postgres
+def test_dates_include_both_days_from_the_rollup(gym):
+    assert PaymentService.get_revenue_summary(
+        gym.id, date(2026, 3, 1), date(2026, 3, 2)) == (Decimal("700"), None)
+
+
+def test_datetimes_keep_exact_timestamp_bounds(gym):
+    assert PaymentService.get_revenue_summary(
+        gym.id, datetime(2026, 3, 1, 12),
+        datetime(2026, 3, 3, 9)) == (Decimal("2200"), None)
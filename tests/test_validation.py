@@ -0,0 +1,45 @@
+import uuid
+
+import pytest
+from flask_jwt_extended import create_access_token
+
+from gym_saas.app.utils.generate_id import generate_id
+from gym_saas.app.utils.validation import validate_id
+from tests.factories import make_gym
+
+ID = "0190a6f4-1c2b-7d3e-8f4a-5b6c7d8e9f01"
+
+
+def test_canonical_ids_are_valid():
+    assert validate_id(ID) == (True, None)
+    assert validate_id(generate_id()) == (True, None)
+    assert validate_id(uuid.UUID(ID)) == (True, None)
+
+
+@pytest.mark.parametrize("value", [
+    f"urn:uuid:{ID}",
+    f"{{{ID}}}",
+    ID.replace("-", ""),
+    ID.upper(),
+    f" {ID}",
+    "not-an-id",
+    "",
+    None,
+    42,
+])
+def test_non_canonical_ids_are_rejected(value):
+    assert validate_id(value) == (False, "Invalid ID format")
+
+
+def test_urn_id_in_url_redirects_instead_of_failing(app, db):
+    gym = make_gym()
+
+    client = app.test_client()
+    client.set_cookie("access_token",
+                      create_access_token(identity=gym.id),
+                      domain="localhost")
+    response = client.get(f"/member/urn:uuid:{ID}/details",
+                          base_url="https://localhost")
+
+    assert response.status_code == 302
+    assert response.headers["Location"].endswith("/member/list")